@@ -0,0 +1,198 @@
+#!/usr/local/bin/python3
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+#   batch solver for GAP instances
+#
+#   Author: Umetani, Shunji <umetani@ist.osaka-u.ac.jp>
+#   Date: 2022/05/18
+# --------------------------------------------------------------------
+
+# import modules -----------------------------------------------------
+import os
+import sys
+import csv
+import glob
+import json
+import time
+import random
+import argparse
+import importlib
+import multiprocessing
+import gap_wls
+import gap_log
+import gap_io
+
+# constant -----------------------------------------------------------
+TIME_LIMIT = 60.0  # default time limit for each instance
+NUM_EPSILON = 0.001  # tolerance for numerical error
+SOLVER = {'wls': 'gap_wls', 'pymip': 'gap_pymip', 'grb': 'gap_grb'}  # solver modules
+FIELDS = ['instance', 'agents', 'jobs', 'obj', 'lb', 'feasible', 'best_time', 'iterations', 'time']  # columns of result table
+
+# function -----------------------------------------------------------
+
+# --------------------------------------------------------------------
+#   collect instance files
+#
+#   paths(I): directories, files or glob patterns
+#   return: sorted list of instance files
+# --------------------------------------------------------------------
+def collect_files(paths):
+    files = set()
+    for path in paths:
+        if os.path.isdir(path):
+            names = [os.path.join(path, name) for name in os.listdir(path)]
+        else:
+            names = glob.glob(path)
+        files.update(name for name in names if os.path.isfile(name) and not os.path.basename(name).startswith('.') and not name.endswith(gap_io.CACHE_EXT))
+    return sorted(files)
+
+
+# --------------------------------------------------------------------
+#   solve an instance
+#
+#   filename(I): instance file
+#   args(I): arguments
+#   return: row of result table
+# --------------------------------------------------------------------
+def solve_instance(filename, args):
+    module = importlib.import_module(SOLVER[args.solver])
+    inst_args = argparse.Namespace(**vars(args))
+    inst_args.filename, inst_args.fix, inst_args.threads, inst_args.names = filename, args.lag, 1, False
+    gap_log.set_level(gap_log.QUIET)
+    start_time = time.time()
+    # read instance
+    gap = module.Gap()
+    gap.read(inst_args)
+    # solve GAP
+    iterations = best_time = lb = None
+    if args.solver == 'wls':
+        param = gap_wls.Param()
+        param.read_search(args)
+        param.lag = args.lag
+        param.seed = args.seed
+        random.seed(param.seed)
+        work = gap_wls.Work(gap)
+        stat = gap_wls.weight_local_search(gap, work, args.time, param)
+        sol = work.sol
+        iterations, best_time = stat.num_iter, stat.best_time
+        if args.lag:
+            lb = stat.lower_bound
+    else:
+        sol = [None for _ in range(gap.num_job)]
+        module.solve_mip(gap, sol, inst_args)
+    total_time = time.time() - start_time
+
+    # evaluate solution
+    row = {'instance': os.path.basename(filename), 'agents': gap.num_agent, 'jobs': gap.num_job,
+           'obj': None, 'lb': lb, 'feasible': False, 'best_time': best_time, 'iterations': iterations, 'time': total_time}
+    if None not in sol:
+        used = [0 for _ in range(gap.num_agent)]
+        obj = 0
+        for j,i in enumerate(sol):
+            used[i] += (gap.res)[i][j]
+            obj += (gap.cost)[i][j]
+        row['obj'] = obj
+        row['feasible'] = all(used[i] <= (gap.cap)[i] for i in range(gap.num_agent))
+    return row
+
+# solve an instance with tuple of arguments --------------------------
+#   an instance raising an error (or exiting) gives an infeasible row,
+#   so that the process pool always receives a result
+def solve_instance_star(task):
+    try:
+        return solve_instance(*task)
+    except (Exception, SystemExit) as e:
+        print('{}: {}'.format(task[0], repr(e)), file=sys.stderr, flush=True)
+        return {'instance': os.path.basename(task[0]), 'agents': None, 'jobs': None, 'obj': None, 'lb': None,
+                'feasible': False, 'best_time': None, 'iterations': None, 'time': None}
+
+
+# --------------------------------------------------------------------
+#   write result table
+#
+#   rows(I): rows of result table
+#   filename(I): output file (.json or .csv)
+# --------------------------------------------------------------------
+def write_result(rows, filename):
+    with open(filename, 'w', newline='') as output_file:
+        if filename.endswith('.json'):
+            json.dump(rows, output_file, indent=1)
+        else:
+            writer = csv.DictWriter(output_file, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+# --------------------------------------------------------------------
+#   parse arguments
+# --------------------------------------------------------------------
+def parse_args():
+    # -s of the solver replaces the short option of --swap
+    parser = argparse.ArgumentParser('GAP batch', conflict_handler='resolve')
+    # directories, files or glob patterns of instances
+    parser.add_argument('paths', nargs='+', help='directories, files or glob patterns of instances')
+    # options of weighting local search (also giving MIP start)
+    gap_wls.add_search_args(parser)
+    # solver
+    parser.add_argument('-s', '--solver', help='solver', choices=list(SOLVER), default='wls')
+    # timelimit for each instance
+    parser.add_argument('-t', '--time', help='time limit for each instance', type=float, default=TIME_LIMIT)
+    # number of processes
+    parser.add_argument('-j', '--jobs', help='number of processes', type=int, default=os.cpu_count())
+    # random seed
+    parser.add_argument('--seed', help='random seed of weighting local search', type=int, default=gap_wls.RANDOM_SEED)
+    # MIP start by weighting local search
+    parser.add_argument('--warm', help='ratio of time limit for weighting local search giving MIP start (pymip, grb)', type=float, default=0.0)
+    # Lagrangian relaxation
+    parser.add_argument('--lag', help='compute lower bound (wls) or fix variables (pymip, grb) by Lagrangian relaxation', action='store_true')
+    # binary cache of instance file
+    parser.add_argument('--no-cache', help='do not use binary cache of instance file', dest='cache', action='store_false')
+    # sparse instance files
+    parser.add_argument('--sparse', help='read sparse instance files of eligible assignments', action='store_true')
+    # output file
+    parser.add_argument('-o', '--output', help='output file of result table (.csv or .json)', default='result.csv')
+    return parser.parse_args()
+
+
+# --------------------------------------------------------------------
+#   main
+# --------------------------------------------------------------------
+def main(argv=sys.argv):
+    # parse arguments
+    args = parse_args()
+
+    # set starting time
+    start_time = time.time()
+
+    # collect instances
+    files = collect_files(args.paths)
+    print('#instances:\t{}'.format(len(files)))
+
+    # solve instances in process pool
+    print('\n[batch solve]')
+    print('\t'.join(FIELDS))
+    rows = []
+    with multiprocessing.Pool(max(1, min(args.jobs, len(files)))) as pool:
+        for row in pool.imap_unordered(solve_instance_star, [(filename, args) for filename in files]):
+            print('\t'.join('' if row[key] is None else '{:.2f}'.format(row[key]) if isinstance(row[key], float) else str(row[key]) for key in FIELDS), flush=True)
+            rows.append(row)
+    rows.sort(key=lambda row: row['instance'])
+
+    # write result table
+    write_result(rows, args.output)
+    print('\nresult:\t{}'.format(args.output))
+
+    # set completion time
+    end_time = time.time()
+
+    # display computation time
+    print('\nTotal time:\t%.3f sec' % (end_time - start_time))
+
+# main ---------------------------------------------------------------
+if __name__ == "__main__":
+    main()
+
+# --------------------------------------------------------------------
+#   end of file
+# --------------------------------------------------------------------
@@ -0,0 +1,683 @@
+#!/usr/local/bin/python3
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+#   benchmarks for weighting local search for GAP
+#
+#   Author: Umetani, Shunji <umetani@ist.osaka-u.ac.jp>
+#   Date: 2022/05/18
+# --------------------------------------------------------------------
+
+# import modules -----------------------------------------------------
+import os
+import sys
+import csv
+import json
+import math
+import time
+import random
+import argparse
+import statistics
+import multiprocessing
+import subprocess
+import tracemalloc
+from array import array
+import gap_wls
+import gap_log
+import gap_batch
+
+# constant -----------------------------------------------------------
+NUM_MOVE = 200000  # default number of moves for micro-benchmark
+NUM_COPY = 1000  # default number of copies for micro-benchmark
+NUM_REPEAT = 3  # default number of repeats for micro-benchmark
+RANDOM_SEED = 0  # default random seed
+SUITE_TIME = 5.0  # default time limit of each run in benchmark suite
+NUM_SEED = 3  # default number of random seeds in benchmark suite
+HISTORY_FILE = 'bench_history.json'  # default history file of benchmark suite
+ALPHA = 0.05  # significance level for comparing runs
+EXACT_SIZE = 50  # largest number of pairs for exact signed-rank test
+INFEAS_GAP = 1.0e6  # gap (%) of infeasible solution for comparing runs
+TTT_TIME = 10.0  # default time limit of each run for time-to-target
+TTT_RUNS = 50  # default number of runs (random seeds) for time-to-target
+NUM_POINT = 100  # default number of time points of convergence curve
+NUM_EPSILON = 0.001  # tolerance for numerical error
+
+# best-known (proven optimal) objective values of OR-Library instances
+BEST_KNOWN = {
+    'a05100': 1698, 'a05200': 3235, 'a10100': 1360, 'a10200': 2623, 'a20100': 1158, 'a20200': 2339,
+    'b05100': 1843, 'b05200': 3552, 'b10100': 1407, 'b10200': 2827, 'b20100': 1166, 'b20200': 2339,
+    'c05100': 1931, 'c05200': 3456, 'c10100': 1402, 'c10200': 2806, 'c10400': 5597,
+    'c20100': 1243, 'c20200': 2391, 'c20400': 4782,
+    'd05100': 6353, 'd05200': 12742, 'd10100': 6347, 'd10200': 12430, 'd10400': 24961,
+    'd20100': 6185, 'd20200': 12235, 'd20400': 24561,
+    'e05100': 12681, 'e05200': 24930, 'e10100': 11577, 'e10200': 23307, 'e10400': 45746,
+    'e20100': 8436, 'e20200': 22379, 'e20400': 44877,
+}
+
+# class --------------------------------------------------------------
+
+# --------------------------------------------------------------------
+#   reference working data with Python lists and sets
+# --------------------------------------------------------------------
+class ListWork:
+    def __init__(self,gap):
+        self.sol = [None for _ in range(gap.num_job)]  # job assignment to agent
+        self.wt = [1.0 for _ in range(gap.num_agent)]  # penalty weight for capacity constraint
+        self.obj = 0.0  # objective value
+        self.used = [0 for _ in range(gap.num_agent)]  # used resource for agent
+        self.plt = 0.0  # weighted penalty
+        self.job = [set() for _ in range(gap.num_agent)]  # set of jobs assigned to each agent
+        self.vio = set()  # set of agents violating capacity constraint
+        self.max_vio = 0  # maximum overload of agents
+
+    # copy -----------------------------------------------------------
+    def copy(self,org):
+        self.sol = org.sol[:]
+        self.wt = org.wt[:]
+        self.obj = org.obj
+        self.used = org.used[:]
+        self.plt = org.plt
+        self.job = [set(jobs) for jobs in org.job]
+        self.vio = set(org.vio)
+        self.max_vio = org.max_vio
+
+    # restore working data from solution ----------------------------
+    def restore(self,gap):
+        for j,i in enumerate(self.sol):
+            (self.used)[i] += (gap.res)[i][j]
+            self.obj += (gap.cost)[i][j]
+            (self.job)[i].add(j)
+        self.calc_plt(gap)
+
+    # the same penalty bookkeeping as gap_wls.Work
+    calc_plt = gap_wls.Work.calc_plt
+    sum_plt = gap_wls.Work.sum_plt
+    update_used = gap_wls.Work.update_used
+
+    # shift job j to agent i ----------------------------------------
+    def shift(self,gap,j,i):
+        i1,i2 = (self.sol)[j],i
+        (self.sol)[j] = i2
+        self.update_used(gap, i1, -(gap.res)[i1][j])
+        self.update_used(gap, i2, (gap.res)[i2][j])
+        self.obj += (gap.cost)[i2][j] - (gap.cost)[i1][j]
+        (self.job)[i1].remove(j)
+        (self.job)[i2].add(j)
+
+
+# --------------------------------------------------------------------
+#   working data with typed arrays
+# --------------------------------------------------------------------
+class ArrayWork(gap_wls.Work):
+    __slots__ = ()
+
+    def __init__(self,gap):
+        super().__init__(gap)
+        self.sol = array('i', self.sol)  # job assignment to agent
+        self.wt = array('d', self.wt)  # penalty weight for capacity constraint
+        self.used = array('i', self.used)  # used resource for agent
+        self.job = [array('i') for _ in range(gap.num_agent)]  # list of jobs assigned to each agent
+        self.pos = array('i', self.pos)  # position of job j in job[sol[j]]
+
+
+# function -----------------------------------------------------------
+
+# --------------------------------------------------------------------
+#   evaluate shift moves as in shift_nb_search
+#
+#   gap(I): GAP data
+#   work(I): working data
+#   moves(I): list of shift moves
+#   return: total difference of penalized objective value
+# --------------------------------------------------------------------
+def eval_moves(gap,work,moves):
+    total = 0.0
+    for j,i in moves:
+        i1,i2 = (work.sol)[j],i
+        delta_obj = (gap.cost)[i2][j] - (gap.cost)[i1][j]
+        cur_plt = max(0, (work.used)[i1] - (gap.cap)[i1])
+        new_plt = max(0, (work.used)[i1] - (gap.res)[i1][j] - (gap.cap)[i1])
+        delta_plt_i1 = (work.wt)[i1] * (new_plt - cur_plt)
+        cur_plt = max(0, (work.used)[i2] - (gap.cap)[i2])
+        new_plt = max(0, (work.used)[i2] + (gap.res)[i2][j] - (gap.cap)[i2])
+        delta_plt_i2 = (work.wt)[i2] * (new_plt -  cur_plt)
+        total += delta_obj + delta_plt_i1 + delta_plt_i2
+    return total
+
+
+# --------------------------------------------------------------------
+#   micro-benchmark of working data
+#
+#   gap(I): GAP data
+#   args(I): arguments
+# --------------------------------------------------------------------
+def bench_work(gap,args):
+    print('\n[micro-benchmark of working data]')
+    # random solution and sequence of shift moves
+    rng = random.Random(RANDOM_SEED)
+    sol = [rng.randrange(gap.num_agent) for _ in range(gap.num_job)]
+    moves = [(rng.randrange(gap.num_job),rng.randrange(gap.num_agent)) for _ in range(args.moves)]
+
+    print('work\tns/eval\tns/move\tus/copy\tbytes/copy')
+    for name,cls in (('set',ListWork),('array',ArrayWork),('slots',gap_wls.Work)):
+        # time per evaluation and shift move (best of repeats)
+        eval_time = move_time = float('inf')
+        for _ in range(args.repeat):
+            work = cls(gap)
+            for j,i in enumerate(sol):
+                (work.sol)[j] = i
+            work.restore(gap)
+            start_time = time.perf_counter()
+            eval_moves(gap,work,moves)
+            eval_time = min(eval_time, (time.perf_counter() - start_time) / len(moves))
+            start_time = time.perf_counter()
+            for j,i in moves:
+                if i != (work.sol)[j]:
+                    work.shift(gap,j,i)
+            move_time = min(move_time, (time.perf_counter() - start_time) / len(moves))
+        # time per copy
+        copies = [cls(gap) for _ in range(args.copies)]
+        start_time = time.perf_counter()
+        for dst in copies:
+            dst.copy(work)
+        copy_time = (time.perf_counter() - start_time) / len(copies)
+        # memory per copy
+        dst = cls(gap)
+        tracemalloc.start()
+        dst.copy(work)
+        size,_ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print('{}\t{:.1f}\t{:.1f}\t{:.2f}\t{}'.format(name,eval_time*1e9,move_time*1e9,copy_time*1e6,size),flush=True)
+
+
+# --------------------------------------------------------------------
+#   read best-known objective values
+#
+#   filename(I): file with lines of instance name and objective value
+#   return: best-known objective values of instances
+# --------------------------------------------------------------------
+def read_best(filename):
+    best = dict(BEST_KNOWN)
+    if filename is not None:
+        with open(filename) as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 2 and not fields[0].startswith('#'):
+                    best[fields[0]] = float(fields[1])
+    return best
+
+
+# --------------------------------------------------------------------
+#   read and write history of benchmark suite
+#
+#   the history file is a JSON list of runs; it is rewritten through
+#   a temporary file so that an interrupted run never corrupts it
+# --------------------------------------------------------------------
+def read_history(filename):
+    if not os.path.exists(filename):
+        return []
+    with open(filename) as f:
+        return json.load(f)
+
+def write_history(filename, history):
+    tmp_fn = filename + '.tmp'
+    with open(tmp_fn, 'w') as f:
+        json.dump(history, f, indent=1)
+    os.replace(tmp_fn, filename)
+
+
+# --------------------------------------------------------------------
+#   current git commit (None if unknown)
+# --------------------------------------------------------------------
+def git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    except OSError:
+        return None
+    return out.stdout.strip() if out.returncode == 0 else None
+
+
+# --------------------------------------------------------------------
+#   gap (%) of run to best-known objective value
+#
+#   the best feasible objective value in the history is used for
+#   instances without best-known value
+#
+#   res(I): result of run
+#   best(I): best-known objective values
+#   return: gap (%), INFEAS_GAP for infeasible solution
+# --------------------------------------------------------------------
+def calc_gap(res, best):
+    if not res['feasible']:
+        return INFEAS_GAP
+    ref = best.get(res['instance'])
+    if ref is None or ref == 0:
+        return 0.0
+    return 100.0 * (res['obj'] - ref) / abs(ref)
+
+
+# --------------------------------------------------------------------
+#   Wilcoxon signed-rank test
+#
+#   the exact null distribution of the rank sum is computed by dynamic
+#   programming over the (doubled, tie-averaged) ranks for up to
+#   EXACT_SIZE nonzero differences, and the normal approximation is
+#   used otherwise
+#
+#   diffs(I): paired differences
+#   return: two-sided p-value
+# --------------------------------------------------------------------
+def signed_rank_test(diffs):
+    diffs = [d for d in diffs if abs(d) > 1e-12]
+    n = len(diffs)
+    if n == 0:
+        return 1.0
+    # doubled ranks of absolute differences (average ranks for ties)
+    order = sorted(range(n), key=lambda k: abs(diffs[k]))
+    rank = [0] * n
+    k = 0
+    while k < n:
+        l = k
+        while l + 1 < n and abs(diffs[order[l+1]]) - abs(diffs[order[k]]) <= 1e-12:
+            l += 1
+        for m in range(k, l + 1):
+            rank[order[m]] = k + l + 2
+        k = l + 1
+    total = sum(rank)
+    w = sum(r for r,d in zip(rank, diffs) if d > 0)
+    if n <= EXACT_SIZE:
+        # count[s]: number of sign patterns with rank sum s
+        count = [0] * (total + 1)
+        count[0] = 1
+        for r in rank:
+            for s in range(total, r - 1, -1):
+                count[s] += count[s-r]
+        tail = sum(count[:min(w, total - w) + 1])
+        return min(1.0, 2.0 * tail / 2 ** n)
+    var = sum(r * r for r in rank) / 4.0
+    z = (abs(w - total / 2.0) - 1.0) / math.sqrt(var)
+    return min(1.0, math.erfc(max(0.0, z) / math.sqrt(2.0)))
+
+
+# --------------------------------------------------------------------
+#   benchmark suite
+#
+#   every instance is solved by weighting local search with random
+#   seeds 0, 1, ..., and the run is appended to the history file
+#
+#   args(I): arguments
+# --------------------------------------------------------------------
+def bench_suite(args):
+    best = read_best(args.best)
+    history = read_history(args.history)
+    param = gap_wls.Param()
+    param.read(args)
+    param.num_worker = 1
+    run = {
+        'label': args.label or time.strftime('%Y%m%d-%H%M%S'),
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'commit': git_commit(),
+        'time': args.time,
+        'seeds': args.seeds,
+        'param': {'engine': param.engine, 'cand_list': param.cand_list, 'swap': param.swap_nb, 'swap_bound': param.swap_bound,
+                  'chain': param.chain_depth, 'init': param.init, 'lag': param.lag, 'adaptive': param.adaptive,
+                  'improve': param.improve, 'top_k': param.top_k},
+        'results': [],
+    }
+    gap_log.set_level(gap_log.QUIET)
+
+    print('\n[benchmark suite: {}]'.format(run['label']))
+    print('instance\tbest\tobj\tgap(%)\tfeas\titer/s\tmoves/s\tfirst\tbest_time')
+    for filename in gap_batch.collect_files(args.paths):
+        gap = gap_wls.Gap()
+        gap.read(argparse.Namespace(filename=filename, cache=args.cache, sparse=args.sparse))
+        name = os.path.basename(filename)
+        rows = []
+        for seed in range(args.seeds):
+            random.seed(seed)
+            param.seed = seed
+            work = gap_wls.Work(gap)
+            stat = gap_wls.weight_local_search(gap, work, args.time, param)
+            feasible = work.plt < NUM_EPSILON
+            rows.append({
+                'instance': name, 'seed': seed, 'agents': gap.num_agent, 'jobs': gap.num_job,
+                'obj': work.obj, 'feasible': feasible,
+                'iterations': stat.num_iter, 'moves': stat.num_move,
+                'moves_per_sec': stat.num_move / max(stat.total_time, 1e-9),
+                'first_time': stat.first_time, 'best_time': stat.best_time if feasible else None,
+                'time': stat.total_time,
+            })
+        run['results'].extend(rows)
+        # mean over seeds
+        feas = [r for r in rows if r['feasible']]
+        firsts = [r['first_time'] for r in rows if r['first_time'] is not None]
+        print('{}\t{}\t{}\t{}\t{}/{}\t{:.1f}\t{:.0f}\t{}\t{}'.format(
+            name, '{:g}'.format(best[name]) if name in best else '-',
+            '{:g}'.format(statistics.mean(r['obj'] for r in feas)) if feas else '-',
+            '{:.3f}'.format(statistics.mean(calc_gap(r, best) for r in feas)) if feas and name in best else '-',
+            len(feas), len(rows),
+            statistics.mean(r['iterations'] / max(r['time'], 1e-9) for r in rows),
+            statistics.mean(r['moves_per_sec'] for r in rows),
+            '{:.2f}'.format(statistics.mean(firsts)) if firsts else '-',
+            '{:.2f}'.format(statistics.mean(r['best_time'] for r in feas)) if feas else '-'), flush=True)
+
+    if args.save:
+        history.append(run)
+        write_history(args.history, history)
+        print('saved run {} to {}'.format(run['label'], args.history))
+    if args.baseline is not None:
+        compare_runs(find_run(history, args.baseline), run, history, best)
+
+
+# --------------------------------------------------------------------
+#   find the latest run with label in history
+# --------------------------------------------------------------------
+def find_run(history, label):
+    for run in reversed(history):
+        if run['label'] == label:
+            return run
+    raise SystemExit('run {} is not found in history'.format(label))
+
+
+# --------------------------------------------------------------------
+#   compare two runs of benchmark suite
+#
+#   results are paired by instance and random seed, and differences of
+#   gap to best-known value and of log throughput (moves/sec) are
+#   tested by the Wilcoxon signed-rank test
+#
+#   base(I): baseline run
+#   run(I): new run
+#   history(I): history of runs
+#   best(I): best-known objective values
+# --------------------------------------------------------------------
+def compare_runs(base, run, history, best):
+    # fall back to the best feasible objective value in history
+    known, best = set(best), dict(best)
+    for past in history + [run]:
+        for res in past['results']:
+            if res['feasible'] and res['instance'] not in known:
+                best[res['instance']] = min(best.get(res['instance'], math.inf), res['obj'])
+    base_res = {(res['instance'], res['seed']): res for res in base['results']}
+    pairs = [(base_res[res['instance'], res['seed']], res) for res in run['results'] if (res['instance'], res['seed']) in base_res]
+    if not pairs:
+        print('no common instances and seeds with {}'.format(base['label']))
+        return
+
+    print('\n[comparison: {} -> {}]'.format(base['label'], run['label']))
+    print('instance\tgap(%)\t\tmoves/s\t\tratio')
+    names = sorted(set(res['instance'] for _,res in pairs))
+    for name in names:
+        sub = [(b, r) for b,r in pairs if r['instance'] == name]
+        base_gap = statistics.mean(calc_gap(b, best) for b,_ in sub)
+        new_gap = statistics.mean(calc_gap(r, best) for _,r in sub)
+        base_mps = statistics.mean(b['moves_per_sec'] for b,_ in sub)
+        new_mps = statistics.mean(r['moves_per_sec'] for _,r in sub)
+        print('{}\t{:.3f} -> {:.3f}\t{:.0f} -> {:.0f}\t{:.3f}'.format(name, base_gap, new_gap, base_mps, new_mps, new_mps / max(base_mps, 1e-9)))
+
+    # significance tests over all pairs
+    gap_diffs = [calc_gap(r, best) - calc_gap(b, best) for b,r in pairs]
+    mps_diffs = [math.log(max(r['moves_per_sec'], 1e-9) / max(b['moves_per_sec'], 1e-9)) for b,r in pairs]
+    if base['time'] != run['time'] or base['param'] != run['param']:
+        print('note: time limits or parameters differ between runs')
+    for metric,diffs,worse in (('gap', gap_diffs, 1.0), ('moves/s', mps_diffs, -1.0)):
+        p = signed_rank_test(diffs)
+        mid = statistics.median(diffs)
+        if p >= ALPHA or mid == 0.0:
+            verdict = 'no significant change'
+        else:
+            verdict = 'regression' if mid * worse > 0 else 'improvement'
+        if metric == 'gap':
+            print('{}:\tmedian diff= {:+.3f}\tp= {:.4f}\t{} ({} pairs)'.format(metric, mid, p, verdict, len(diffs)))
+        else:
+            print('{}:\tmedian ratio= {:.3f}\tp= {:.4f}\t{} ({} pairs)'.format(metric, math.exp(mid), p, verdict, len(diffs)))
+
+
+# --------------------------------------------------------------------
+#   run weighting local search recording trace of incumbent solution
+#
+#   filename(I): instance file
+#   seed(I): random seed
+#   args(I): arguments
+#   target(I): objective value to stop at (None: run until time limit)
+#   return: seed, trace and statistics of run
+# --------------------------------------------------------------------
+def run_trace(filename, seed, args, target):
+    gap_log.set_level(gap_log.QUIET)
+    gap = gap_wls.Gap()
+    gap.read(argparse.Namespace(filename=filename, cache=args.cache, sparse=args.sparse))
+    param = gap_wls.Param()
+    param.read(args)
+    param.num_worker = 1
+    param.seed = seed
+    param.trace = True
+    param.target = target
+    random.seed(seed)
+    work = gap_wls.Work(gap)
+    stat = gap_wls.weight_local_search(gap, work, args.time, param)
+    return {'seed': seed, 'trace': stat.trace, 'iterations': stat.num_iter, 'time': stat.total_time}
+
+# run weighting local search with tuple of arguments -----------------
+def run_trace_star(task):
+    return run_trace(*task)
+
+
+# --------------------------------------------------------------------
+#   time to reach target in trace
+#
+#   trace(I): (time, iteration, objective value) of improvements
+#   target(I): target objective value
+#   return: time and iteration (None if target is not reached)
+# --------------------------------------------------------------------
+def time_to_target(trace, target):
+    for t,it,obj in trace:
+        if obj <= target + NUM_EPSILON:
+            return t, it
+    return None, None
+
+
+# --------------------------------------------------------------------
+#   best objective value in trace at time t (None if infeasible)
+# --------------------------------------------------------------------
+def obj_at(trace, t):
+    obj = None
+    for time_,_,value in trace:
+        if time_ > t:
+            break
+        obj = value
+    return obj
+
+
+# --------------------------------------------------------------------
+#   fit shifted exponential distribution to time-to-target
+#
+#   the line through the first and third quartiles of the TTT plot
+#   (sorted times against quantiles -ln(1 - p) of the exponential
+#   distribution) gives the shift mu and the mean lambda of
+#   F(t) = 1 - exp(-(t - mu) / lambda)
+#
+#   times(I): sorted times to target
+#   probs(I): empirical probabilities of times
+#   return: mu and lambda (None if fewer than 2 times)
+# --------------------------------------------------------------------
+def fit_exponential(times, probs):
+    if len(times) < 2:
+        return None, None
+    k1, k3 = (len(times) - 1) // 4, (3 * len(times) - 1) // 4
+    if k1 == k3:
+        k1, k3 = 0, len(times) - 1
+    z1, z3 = -math.log(1.0 - probs[k1]), -math.log(1.0 - probs[k3])
+    lam = (times[k3] - times[k1]) / (z3 - z1)
+    return times[k1] - lam * z1, lam
+
+
+# --------------------------------------------------------------------
+#   write rows to CSV file
+# --------------------------------------------------------------------
+def write_csv(filename, fields, rows):
+    with open(filename, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        writer.writerows(rows)
+
+
+# --------------------------------------------------------------------
+#   time-to-target and convergence curve
+#
+#   one instance is solved with random seeds 0, 1, ... in a process
+#   pool, each run recording the trace of the incumbent solution; the
+#   target is given by --target, or the best-known value (or the best
+#   objective value over the runs if unknown) relaxed by --gap (%)
+#
+#   three CSV files are written:
+#     PREFIX.ttt.csv: time to target of each run in ascending order
+#                     with empirical and fitted exponential probability
+#                     (TTT plot; unreached runs have empty time)
+#     PREFIX.curve.csv: number of feasible runs and mean, median, min
+#                       and max objective values over runs at time points
+#     PREFIX.trace.csv: improvements of incumbent solution of all runs
+#
+#   args(I): arguments
+# --------------------------------------------------------------------
+def bench_ttt(args):
+    name = os.path.basename(args.filename)
+    prefix = args.output or name
+    best = read_best(args.best)
+    target = args.target
+    if target is None and name in best:
+        target = best[name] + abs(best[name]) * args.gap / 100.0
+    # runs stop at target if it is known in advance
+    tasks = [(args.filename, seed, args, target) for seed in range(args.runs)]
+    print('\n[time-to-target: {}]'.format(name))
+    runs = []
+    with multiprocessing.Pool(max(1, min(args.jobs, args.runs))) as pool:
+        for run in pool.imap_unordered(run_trace_star, tasks):
+            runs.append(run)
+    runs.sort(key=lambda run: run['seed'])
+    if target is None:
+        objs = [run['trace'][-1][2] for run in runs if run['trace']]
+        if not objs:
+            print('no feasible solution found')
+            return
+        target = min(objs) + abs(min(objs)) * args.gap / 100.0
+    print('target:\t{:g}'.format(target))
+
+    # time to target
+    ttt = []
+    for run in runs:
+        t, it = time_to_target(run['trace'], target)
+        ttt.append((t, run['seed'], it))
+    reached = sorted(row for row in ttt if row[0] is not None)
+    probs = [(k + 0.5) / len(runs) for k in range(len(reached))]
+    mu, lam = fit_exponential([row[0] for row in reached], probs)
+    rows = []
+    for (t, seed, it),p in zip(reached, probs):
+        fit = '' if lam is None or lam <= 0.0 else max(0.0, 1.0 - math.exp(-(t - mu) / lam))
+        rows.append([seed, t, it, p, fit])
+    rows.extend([seed, '', '', '', ''] for t,seed,_ in ttt if t is None)
+    write_csv(prefix + '.ttt.csv', ['seed', 'time', 'iteration', 'prob', 'fit'], rows)
+
+    # convergence curve
+    rows = []
+    for k in range(args.points + 1):
+        t = args.time * k / args.points
+        objs = [obj for obj in (obj_at(run['trace'], t) for run in runs) if obj is not None]
+        rows.append([t, len(objs)] + ([statistics.mean(objs), statistics.median(objs), min(objs), max(objs)] if objs else ['', '', '', '']))
+    write_csv(prefix + '.curve.csv', ['time', 'feasible', 'mean', 'median', 'min', 'max'], rows)
+    write_csv(prefix + '.trace.csv', ['seed', 'time', 'iteration', 'obj'], [[run['seed'], t, it, obj] for run in runs for t,it,obj in run['trace']])
+
+    # summary
+    times = [row[0] for row in reached]
+    print('reached:\t{}/{}'.format(len(times), len(runs)))
+    if times:
+        print('ttt mean:\t{:.3f} sec\tmedian: {:.3f} sec\tmax: {:.3f} sec'.format(statistics.mean(times), statistics.median(times), max(times)))
+    if lam is not None:
+        print('exponential fit:\tmu= {:.3f}\tlambda= {:.3f}'.format(mu, lam))
+    print('iter/s:\t{:.1f}'.format(statistics.mean(run['iterations'] / max(run['time'], 1e-9) for run in runs)))
+    print('output:\t{0}.ttt.csv, {0}.curve.csv, {0}.trace.csv'.format(prefix))
+
+
+# --------------------------------------------------------------------
+#   add options of weighting local search
+# --------------------------------------------------------------------
+def add_solver_args(parser):
+    parser.add_argument('--no-cache', help='do not use binary cache of instance file', dest='cache', action='store_false')
+    parser.add_argument('--sparse', help='read sparse instance files of eligible assignments', action='store_true')
+    gap_wls.add_search_args(parser)
+    parser.add_argument('--lag', help='compute lower bound by Lagrangian relaxation', action='store_true')
+    parser.set_defaults(workers=1, events=None, checkpoint=None, ckpt_intvl=gap_wls.CKPT_INTVL, resume=False)
+
+
+# --------------------------------------------------------------------
+#   parse arguments
+# --------------------------------------------------------------------
+def parse_args():
+    parser = argparse.ArgumentParser('GAP benchmark')
+    sub = parser.add_subparsers(dest='command', required=True)
+    # micro-benchmark of working data
+    micro = sub.add_parser('micro', help='micro-benchmark of working data')
+    micro.add_argument('filename', action='store')
+    micro.add_argument('--no-cache', help='do not use binary cache of instance file', dest='cache', action='store_false')
+    micro.add_argument('-m', '--moves', help='number of shift moves', type=int, default=NUM_MOVE)
+    micro.add_argument('-c', '--copies', help='number of copies', type=int, default=NUM_COPY)
+    micro.add_argument('-r', '--repeat', help='number of repeats for timing moves', type=int, default=NUM_REPEAT)
+    micro.set_defaults(sparse=False)
+    # benchmark suite with regression tracking
+    suite = sub.add_parser('suite', help='benchmark suite over instances with history of runs')
+    suite.add_argument('paths', nargs='*', default=['instance'], help='directories, files or glob patterns of instances')
+    suite.add_argument('-t', '--time', help='time limit of each run', type=float, default=SUITE_TIME)
+    suite.add_argument('-n', '--seeds', help='number of random seeds for each instance', type=int, default=NUM_SEED)
+    suite.add_argument('--label', help='label of run (date and time if omitted)')
+    suite.add_argument('--history', help='history file of runs', default=HISTORY_FILE)
+    suite.add_argument('--no-save', help='do not append run to history file', dest='save', action='store_false')
+    suite.add_argument('-b', '--baseline', help='compare with the latest run of this label in history')
+    suite.add_argument('--best', help='file of best-known objective values (lines of instance name and value)')
+    add_solver_args(suite)
+    # comparison of runs in history
+    compare = sub.add_parser('compare', help='compare two runs in history')
+    compare.add_argument('baseline', help='label of baseline run')
+    compare.add_argument('label', help='label of new run')
+    compare.add_argument('--history', help='history file of runs', default=HISTORY_FILE)
+    compare.add_argument('--best', help='file of best-known objective values (lines of instance name and value)')
+    # time-to-target and convergence curve
+    ttt = sub.add_parser('ttt', help='time-to-target and convergence curve over random seeds')
+    ttt.add_argument('filename', action='store')
+    ttt.add_argument('-t', '--time', help='time limit of each run', type=float, default=TTT_TIME)
+    ttt.add_argument('-n', '--runs', help='number of runs (random seeds 0, 1, ...)', type=int, default=TTT_RUNS)
+    ttt.add_argument('-j', '--jobs', help='number of processes', type=int, default=os.cpu_count())
+    ttt.add_argument('--target', help='target objective value (best-known value if omitted)', type=float)
+    ttt.add_argument('--gap', help='relax default target by this gap (%%)', type=float, default=0.0)
+    ttt.add_argument('--best', help='file of best-known objective values (lines of instance name and value)')
+    ttt.add_argument('--points', help='number of time intervals of convergence curve', type=int, default=NUM_POINT)
+    ttt.add_argument('-o', '--output', help='prefix of output CSV files (instance name if omitted)')
+    add_solver_args(ttt)
+    return parser.parse_args()
+
+
+# --------------------------------------------------------------------
+#   main
+# --------------------------------------------------------------------
+def main(argv=sys.argv):
+    # parse arguments
+    args = parse_args()
+
+    # run benchmark
+    if args.command == 'micro':
+        gap = gap_wls.Gap()
+        gap.read(args)
+        bench_work(gap,args)
+    elif args.command == 'suite':
+        bench_suite(args)
+    elif args.command == 'ttt':
+        bench_ttt(args)
+    elif args.command == 'compare':
+        history = read_history(args.history)
+        compare_runs(find_run(history, args.baseline), find_run(history, args.label), history, read_best(args.best))
+
+# main ---------------------------------------------------------------
+if __name__ == "__main__":
+    main()
+
+# --------------------------------------------------------------------
+#   end of file
+# --------------------------------------------------------------------
@@ -0,0 +1,141 @@
+#!/usr/local/bin/python3
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+#   checkpoint of weighting local search
+#
+#   Author: Umetani, Shunji <umetani@ist.osaka-u.ac.jp>
+#   Date: 2022/05/18
+# --------------------------------------------------------------------
+
+# import modules -----------------------------------------------------
+import os
+import math
+import random
+import struct
+
+# constant -----------------------------------------------------------
+CKPT_MAGIC = b'GAPC'  # magic number of checkpoint file
+CKPT_VERSION = 2  # version of checkpoint file format
+HEADER = struct.Struct('<4sHiiqq10d')  # magic, version, agents, jobs, iterations, moves and float values
+RNG_SIZE = 625  # size of internal state of Mersenne Twister (624 words and position)
+SCHED = struct.Struct('<qqq4d')  # calls, skips, evaluations and float values of neighborhood search in scheduler
+
+# function -----------------------------------------------------------
+
+# --------------------------------------------------------------------
+#   write checkpoint
+#
+#   the file holds the incumbent solution, the current solution with
+#   penalty weights and the order of jobs on each agent (which
+#   determines the order of the swap neighborhood), the counters of the
+#   search, the state of the random module and the state of the
+#   adaptive scheduler of neighborhood searches (if any); it is written
+#   to a temporary file and renamed, so a crash never leaves a broken
+#   file
+#
+#   filename(I): checkpoint file
+#   gap(I): GAP data
+#   work(I): working data of incumbent solution
+#   cur_work(I): current working data
+#   stat(I): statistics of search (num_iter is the next iteration)
+#   elapsed(I): elapsed time of weighting local search
+#   lag_time(I): time of Lagrangian relaxation
+#   sched(I): adaptive scheduler of neighborhood searches (None: not used)
+# --------------------------------------------------------------------
+def write_checkpoint(filename, gap, work, cur_work, stat, elapsed, lag_time, sched=None):
+    num_agent, num_job = gap.num_agent, gap.num_job
+    version, state, gauss = random.getstate()
+    first_time = math.nan if stat.first_time is None else stat.first_time
+    gauss = math.nan if gauss is None else gauss
+    data = [HEADER.pack(CKPT_MAGIC, CKPT_VERSION, num_agent, num_job, stat.num_iter, cur_work.num_move,
+                        elapsed, lag_time, stat.best_time, first_time, stat.lower_bound,
+                        work.obj, work.plt, cur_work.obj, cur_work.plt, gauss),
+            struct.pack('<{}i'.format(num_job), *work.sol),
+            struct.pack('<{}i'.format(num_job), *cur_work.sol),
+            struct.pack('<{}i'.format(num_job), *(j for jobs in cur_work.job for j in jobs)),
+            struct.pack('<{}d'.format(num_agent), *cur_work.wt),
+            struct.pack('<i{}I'.format(RNG_SIZE), version, *state)]
+    names = [] if sched is None else sched.names
+    data.append(struct.pack('<i', len(names)))
+    for nb in names:
+        data.append(SCHED.pack((sched.calls)[nb], (sched.skip)[nb], (sched.total_evals)[nb],
+                               (sched.gain)[nb], (sched.evals)[nb], (sched.total_gain)[nb], (sched.total_time)[nb]))
+    tmp_fn = filename + '.tmp'
+    with open(tmp_fn, 'wb') as f:
+        f.write(b''.join(data))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_fn, filename)
+
+
+# --------------------------------------------------------------------
+#   read checkpoint
+#
+#   filename(I): checkpoint file
+#   gap(I): GAP data
+#   work(O): working data of incumbent solution
+#   cur_work(O): current working data
+#   stat(O): statistics of search
+#   sched(O): adaptive scheduler of neighborhood searches (None: not used)
+#   return: elapsed time of weighting local search, time of Lagrangian relaxation
+# --------------------------------------------------------------------
+def read_checkpoint(filename, gap, work, cur_work, stat, sched=None):
+    num_agent, num_job = gap.num_agent, gap.num_job
+    with open(filename, 'rb') as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise ValueError('{}: not a checkpoint file'.format(filename))
+    (magic, version, ckpt_agent, ckpt_job, stat.num_iter, cur_work.num_move,
+     elapsed, lag_time, stat.best_time, first_time, stat.lower_bound,
+     work_obj, work_plt, cur_obj, cur_plt, gauss) = HEADER.unpack_from(data)
+    if magic != CKPT_MAGIC or version != CKPT_VERSION:
+        raise ValueError('{}: not a checkpoint file of version {}'.format(filename, CKPT_VERSION))
+    if (ckpt_agent, ckpt_job) != (num_agent, num_job):
+        raise ValueError('{}: checkpoint of {} agents and {} jobs'.format(filename, ckpt_agent, ckpt_job))
+    size = HEADER.size + 4 * (3 * num_job + 1 + RNG_SIZE) + 8 * num_agent
+    if len(data) < size + 4:
+        raise ValueError('{}: broken checkpoint file'.format(filename))
+    num_nb, = struct.unpack_from('<i', data, size)
+    if len(data) != size + 4 + SCHED.size * num_nb:
+        raise ValueError('{}: broken checkpoint file'.format(filename))
+    if num_nb != (0 if sched is None else len(sched.names)):
+        raise ValueError('{}: checkpoint of {} neighborhood searches in adaptive scheduler'.format(filename, num_nb))
+    stat.first_time = None if math.isnan(first_time) else first_time
+    offset = HEADER.size
+    def unpack(fmt, size):
+        nonlocal offset
+        values = struct.unpack_from('<{}{}'.format(size, fmt), data, offset)
+        offset += struct.calcsize('<{}{}'.format(size, fmt))
+        return list(values)
+    work_sol = unpack('i', num_job)
+    cur_sol = unpack('i', num_job)
+    order = unpack('i', num_job)
+    cur_wt = unpack('d', num_agent)
+    rng = unpack('I', RNG_SIZE + 1)
+    random.setstate((rng[0], tuple(rng[1:]), None if math.isnan(gauss) else gauss))
+    offset += 4
+    for nb in ([] if sched is None else sched.names):
+        ((sched.calls)[nb], (sched.skip)[nb], (sched.total_evals)[nb],
+         (sched.gain)[nb], (sched.evals)[nb], (sched.total_gain)[nb], (sched.total_time)[nb]) = SCHED.unpack_from(data, offset)
+        offset += SCHED.size
+
+    # incumbent solution
+    work.sol = work_sol
+    work.restore(gap)
+    work.obj, work.plt = work_obj, work_plt
+    # current solution with the same order of jobs on each agent
+    cur_work.sol = cur_sol
+    cur_work.wt = cur_wt
+    cur_work.calc_used(gap)
+    cur_work.calc_plt(gap)
+    for jobs in cur_work.job:
+        del jobs[:]
+    for j in order:
+        cur_work.add_job(cur_sol[j], j)
+    cur_work.obj, cur_work.plt = cur_obj, cur_plt
+    return elapsed, lag_time
+
+# --------------------------------------------------------------------
+#   end of file
+# --------------------------------------------------------------------
@@ -0,0 +1,59 @@
+#!/usr/local/bin/python3
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+#   event stream for GAP solvers
+#
+#   Author: Umetani, Shunji <umetani@ist.osaka-u.ac.jp>
+#   Date: 2022/05/18
+# --------------------------------------------------------------------
+
+# import modules -----------------------------------------------------
+import sys
+import json
+import math
+
+# class --------------------------------------------------------------
+
+# --------------------------------------------------------------------
+#   observer writing events as newline-delimited JSON (NDJSON)
+#
+#   an observer is any callable taking an event, which is a dict with
+#   the kind of event in 'event' ('start', 'improve', 'stat', 'final');
+#   each event is written as one line and flushed immediately
+# --------------------------------------------------------------------
+class EventStream:
+    def __init__(self,dest):
+        if dest == '-':
+            self.file, self.own = sys.stdout, False
+        elif dest.isdigit():
+            self.file, self.own = open(int(dest), 'w', closefd=False), True
+        else:
+            self.file, self.own = open(dest, 'w'), True
+
+    # write event ----------------------------------------------------
+    def __call__(self,event):
+        self.file.write(json.dumps({key: encode(value) for key,value in event.items()}, separators=(',',':')) + '\n')
+        self.file.flush()
+
+    # close stream ---------------------------------------------------
+    def close(self):
+        if self.own:
+            self.file.close()
+
+
+# function -----------------------------------------------------------
+
+# --------------------------------------------------------------------
+#   encode value of event for JSON
+#
+#   infinite values (e.g., missing lower bound) are written as null
+# --------------------------------------------------------------------
+def encode(value):
+    if isinstance(value, float) and math.isinf(value):
+        return None
+    return value
+
+# --------------------------------------------------------------------
+#   end of file
+# --------------------------------------------------------------------
@@ -12,61 +12,25 @@
 import sys
 import time
 import argparse
+import gap_log
+import gap_lag
+import gap_wls
 from gurobipy import *
 
 # constant -----------------------------------------------------------
 TIME_LIMIT = 60.0  # default time limit for solver
+LAG_TIME_RATIO = 0.1  # ratio of time limit for Lagrangian relaxation
+WARM_TIME_RATIO = 0.0  # default ratio of time limit for weighting local search (0: no MIP start)
+NUM_THREAD = 1  # default number of threads
 
 
 # class --------------------------------------------------------------
 
 # --------------------------------------------------------------------
-#   GAP data
+#   GAP data (shared with weighting local search, which also reads
+#   sparse instance files)
 # --------------------------------------------------------------------
-class Gap:
-    def __init__(self):
-        self.num_agent = 0  # number of agents
-        self.num_job = 0  # number of jobs
-        self.cost = []  # c[i,j]: cost for assignment of job j to agent i
-        self.res = []  # a[i,j]: resource consumption for assignment of job j to agenet i
-        self.cap = []  # b[i]: resource capacity of agent i
-
-    # read GAP data --------------------------------------------------
-    def read(self, args):
-        # open file and read data
-        input_file = open(args.filename, 'r')
-        data = input_file.read()
-        input_file.close()
-        data = data.split()
-        # initialize GAP data
-        self.num_agent = int(data[0])  # number of agents
-        self.num_job = int(data[1])  # number of jobs
-        self.cost = [[0 for j in range(self.num_job)] for i in range(self.num_agent)]
-        self.res = [[0 for j in range(self.num_job)] for i in range(self.num_agent)]
-        self.cap = [0 for i in range(self.num_agent)]
-        cnt = 2
-        # read cost
-        for i in range(self.num_agent):
-            for j in range(self.num_job):
-                (self.cost)[i][j] = int(data[cnt])
-                cnt +=1
-        # read resource consumption
-        for i in range(self.num_agent):
-            for j in range(self.num_job):
-                (self.res)[i][j] = int(data[cnt])
-                cnt +=1
-        # read resource capacity
-        for i in range(self.num_agent):
-            (self.cap)[i] = int(data[cnt])
-            cnt +=1
-
-    # write GAP data --------------------------------------------------
-    def write(self):
-        print('#agents:\t{}'.format(self.num_agent))
-        print('#jobs:\t\t{}'.format(self.num_job))
-        print('cost:\t{}'.format(self.cost))
-        print('resource:\t{}'.format(self.res))
-        print('capacity:\t{}'.format(self.cap))
+Gap = gap_wls.Gap
 
 
 # --------------------------------------------------------------------
@@ -77,29 +41,56 @@ class Gap:
 #   args(I): arguments
 # --------------------------------------------------------------------
 def solve_mip(gap, sol, args):
-    print('\n[solve MIP model]')
+    gap_log.log(gap_log.SUMMARY, '\n[solve MIP model]')
+
+    time_limit = args.time
+    # initial solution by weighting local search
+    ub, init = float('inf'), None
+    if args.warm > 0.0:
+        start_time = time.time()
+        param = gap_wls.Param()
+        param.read_search(args)
+        ub, init = gap_wls.warm_start(gap, args.warm * time_limit, param)
+        time_limit -= time.time() - start_time
+
+    # fix variables by Lagrangian relaxation
+    free = None
+    if args.fix:
+        start_time = time.time()
+        free = gap_lag.fix_vars_lagrange(gap, LAG_TIME_RATIO * time_limit, ub)
+        time_limit -= time.time() - start_time
 
     # generate MIP model
+    build_time = time.time()
     mip_model = Model('MIP model')
 
-    # variables
+    # variables (coefficients of objective function are given here)
     x = {}
     for i in range(gap.num_agent):
-        for j in range(gap.num_job):
-                x[i,j] = mip_model.addVar(vtype=GRB.BINARY, name='x({0},{1})'.format(i,j))
+        for j in (gap.elig_job)[i]:
+            if free is None or free[i][j]:
+                x[i,j] = mip_model.addVar(vtype=GRB.BINARY, obj=(gap.cost)[i][j], name='x({0},{1})'.format(i,j) if args.names else '')
 
     # objective function
-    mip_model.setObjective(quicksum((gap.cost)[i][j] * x[i,j] for i,j in x), GRB.MINIMIZE)
+    mip_model.ModelSense = GRB.MINIMIZE
 
-    # constraints
+    # constraints (built from lists of variables of each agent and job)
     for i in range(gap.num_agent):
-        mip_model.addConstr(quicksum((gap.res)[h][j] * x[h,j] for h,j in x if h == i) <= (gap.cap)[i], name='AGENT({})'.format(i))
+        jobs = [j for j in (gap.elig_job)[i] if (i,j) in x]
+        mip_model.addLConstr(LinExpr([(gap.res)[i][j] for j in jobs], [x[i,j] for j in jobs]), GRB.LESS_EQUAL, (gap.cap)[i], name='AGENT({})'.format(i) if args.names else '')
     for j in range(gap.num_job):
-        mip_model.addConstr(quicksum(x[i,h] for i,h in x if h == j) == 1, name='JOB({})'.format(j))
+        agents = [i for i in (gap.elig_agent)[j] if (i,j) in x]
+        mip_model.addLConstr(LinExpr([1.0] * len(agents), [x[i,j] for i in agents]), GRB.EQUAL, 1.0, name='JOB({})'.format(j) if args.names else '')
+
+    # MIP start
+    if init is not None:
+        for (i,j),var in x.items():
+            var.Start = 1.0 if init[j] == i else 0.0
 
     mip_model.update()
-    print('#vars:\t{}'.format(mip_model.NumVars))
-    print('#csts:\t{}'.format(mip_model.NumConstrs))
+    gap_log.log(gap_log.SUMMARY, '#vars:\t{}', mip_model.NumVars)
+    gap_log.log(gap_log.SUMMARY, '#csts:\t{}', mip_model.NumConstrs)
+    gap_log.log(gap_log.SUMMARY, 'build time:\t{:.3f} sec', time.time() - build_time)
 
     # write LP file
     #fn_base, fn_ext = os.path.splitext(os.path.basename(args.filename))  # filename and extension
@@ -107,21 +98,20 @@ def solve_mip(gap, sol, args):
     #mip_model.write(cpxlp_fn)
 
     # solve MIP model
-    mip_model.setParam('TimeLimit',args.time)  # set timelimit
+    mip_model.setParam('OutputFlag',1 if gap_log.enabled(gap_log.SUMMARY) else 0)  # display solver log
+    mip_model.setParam('TimeLimit',time_limit)  # set timelimit
     mip_model.setParam('MIPGap',0)
     mip_model.setParam('MIPGapAbs',0)
-    mip_model.setParam('Threads',1)
+    mip_model.setParam('Threads',args.threads)
     mip_model.optimize()
 
     # get solution
     if mip_model.getAttr(GRB.Attr.SolCount) == 0:
-        print('No feasible solution has been found!')
-        sys.exit(1)
+        gap_log.log(gap_log.QUIET, 'No feasible solution has been found!')
     else:
         for i,j in x:
             if x[i,j].x > 0.5:
                 sol[j] = i
-    print(sol)
     mip_model.close()
 
 # --------------------------------------------------------------------
@@ -133,6 +123,22 @@ def parse_args():
     parser.add_argument('filename', action='store')
     # timelimit for solver
     parser.add_argument('-t', '--time', help='time limit for weighting local search', type=float, default=TIME_LIMIT)
+    # binary cache of instance file
+    parser.add_argument('--no-cache', help='do not use binary cache of instance file', dest='cache', action='store_false')
+    # sparse instance file
+    parser.add_argument('--sparse', help='read sparse instance file of eligible assignments', action='store_true')
+    # variable fixing by Lagrangian relaxation
+    parser.add_argument('--fix', help='fix variables to 0 by reduced costs of Lagrangian relaxation', action='store_true')
+    # names of variables and constraints
+    parser.add_argument('--names', help='give names to variables and constraints (slower model construction)', action='store_true')
+    # MIP start by weighting local search
+    parser.add_argument('-w', '--warm', help='ratio of time limit for weighting local search giving MIP start', type=float, default=WARM_TIME_RATIO)
+    # options of weighting local search giving MIP start
+    gap_wls.add_search_args(parser)
+    # number of threads
+    parser.add_argument('-p', '--threads', help='number of threads', type=int, default=NUM_THREAD)
+    # log level
+    parser.add_argument('-l', '--log', help='log level', choices=list(gap_log.LEVELS), default=gap_log.LOG_LEVEL)
     return parser.parse_args()
 
 # --------------------------------------------------------------------
@@ -141,6 +147,7 @@ def parse_args():
 def main(argv=sys.argv):
     # parse arguments
     args = parse_args()
+    gap_log.set_level(args.log)
 
     # set starting time
     start_time = time.time()
@@ -148,17 +155,19 @@ def main(argv=sys.argv):
     # read instance
     gap = Gap()
     gap.read(args)
-    gap.write()
+    if gap_log.enabled(gap_log.TRACE):
+        gap.write()
 
     # solve GAP
     sol = [None for _ in range(gap.num_job)]
     solve_mip(gap,sol,args)
+    print(sol)
 
     # set completion time
     end_time = time.time()
 
     # display computation time
-    print('\nTotal time:\t%.3f sec' % (end_time - start_time))
+    gap_log.log(gap_log.SUMMARY, '\nTotal time:\t{:.3f} sec', end_time - start_time)
 
 # main ---------------------------------------------------------------
 if __name__ == "__main__":
@@ -0,0 +1,178 @@
+#!/usr/local/bin/python3
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+#   loader of GAP instances with binary cache
+#
+#   Author: Umetani, Shunji <umetani@ist.osaka-u.ac.jp>
+#   Date: 2022/05/18
+# --------------------------------------------------------------------
+
+# import modules -----------------------------------------------------
+import os
+import hashlib
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# constant -----------------------------------------------------------
+CACHE_EXT = '.cache.npy'  # extension of binary cache file
+CACHE_MAGIC = 0x47415031  # magic number of binary cache file
+HEADER_SIZE = 4  # magic number, mtime (ns), file size and hash of instance file
+
+# function -----------------------------------------------------------
+
+# --------------------------------------------------------------------
+#   read GAP data
+#
+#   filename(I): instance file
+#   cache(I): use binary cache file -> True
+#   return: number of agents, number of jobs, cost, resource consumption, capacity
+# --------------------------------------------------------------------
+def read_gap(filename, cache=True):
+    data = load_data(filename, cache)
+    num_agent, num_job = int(data[0]), int(data[1])
+    size = num_agent * num_job
+    if len(data) < 2 + 2 * size + num_agent:
+        raise ValueError('{}: too few values for {} agents and {} jobs'.format(filename, num_agent, num_job))
+    if np is not None:
+        cost = data[2:2+size].reshape(num_agent, num_job).tolist()
+        res = data[2+size:2+2*size].reshape(num_agent, num_job).tolist()
+        cap = data[2+2*size:2+2*size+num_agent].tolist()
+    else:
+        cost = [data[2+i*num_job:2+(i+1)*num_job] for i in range(num_agent)]
+        res = [data[2+size+i*num_job:2+size+(i+1)*num_job] for i in range(num_agent)]
+        cap = data[2+2*size:2+2*size+num_agent]
+    return num_agent, num_job, cost, res, cap
+
+
+# --------------------------------------------------------------------
+#   read sparse GAP data
+#
+#   a sparse instance file lists only eligible assignments row by row
+#   (CSR style): number of agents m and number of jobs n; for each
+#   agent i, the number of its eligible jobs k[i] followed by k[i]
+#   triples (j, c[i,j], a[i,j]) with 0-based job j; and finally the m
+#   capacities b[i]
+#
+#   filename(I): instance file
+#   cache(I): use binary cache file -> True
+#   return: number of agents, number of jobs, cost, resource consumption
+#           (dict {j: value} for each agent), capacity
+# --------------------------------------------------------------------
+def read_sparse(filename, cache=True):
+    data = load_data(filename, cache)
+    data = data.tolist() if np is not None else data
+    num_agent, num_job = int(data[0]), int(data[1])
+    cost = [{} for _ in range(num_agent)]
+    res = [{} for _ in range(num_agent)]
+    k = 2
+    for i in range(num_agent):
+        if k >= len(data) or k + 1 + 3 * data[k] > len(data):
+            raise ValueError('{}: too few values for eligible jobs of agent {}'.format(filename, i))
+        row = data[k+1:k+1+3*data[k]]
+        k += 1 + 3 * data[k]
+        for h in range(0, len(row), 3):
+            j = row[h]
+            if not 0 <= j < num_job:
+                raise ValueError('{}: job {} of agent {} out of range'.format(filename, j, i))
+            cost[i][j], res[i][j] = row[h+1], row[h+2]
+    if len(data) < k + num_agent:
+        raise ValueError('{}: too few values for {} capacities'.format(filename, num_agent))
+    return num_agent, num_job, cost, res, data[k:k+num_agent]
+
+
+# --------------------------------------------------------------------
+#   load all values of instance file
+#
+#   the values are parsed in bulk by NumPy and saved to a binary cache
+#   file next to the instance file, which is memory-mapped on later
+#   loads; the cache is valid while the mtime and size of the instance
+#   file are unchanged, or while the hash of its contents is unchanged
+#
+#   filename(I): instance file
+#   cache(I): use binary cache file -> True
+#   return: sequence of values (NumPy array or list)
+# --------------------------------------------------------------------
+def load_data(filename, cache=True):
+    if np is None:
+        with open(filename, 'r') as input_file:
+            return list(map(int, input_file.read().split()))
+
+    cache_fn = filename + CACHE_EXT
+    stat = os.stat(filename)
+    text = None
+    if cache:
+        header, data = read_cache(cache_fn)
+        if header is not None:
+            if header[1] == stat.st_mtime_ns and header[2] == stat.st_size:
+                return data
+            # mtime changed: compare hash of contents
+            with open(filename, 'rb') as input_file:
+                text = input_file.read()
+            if header[2] == len(text) and header[3] == calc_hash(text):
+                write_cache(cache_fn, stat, text, data)
+                return data
+
+    # parse instance file
+    if text is None:
+        with open(filename, 'rb') as input_file:
+            text = input_file.read()
+    data = np.fromstring(text.decode(), dtype=np.int64, sep=' ')
+    if cache:
+        write_cache(cache_fn, stat, text, data)
+    return data
+
+
+# --------------------------------------------------------------------
+#   hash of contents of instance file
+#
+#   text(I): contents of instance file
+#   return: signed 64-bit hash value
+# --------------------------------------------------------------------
+def calc_hash(text):
+    return int.from_bytes(hashlib.blake2b(text, digest_size=8).digest(), 'little', signed=True)
+
+
+# --------------------------------------------------------------------
+#   read binary cache file
+#
+#   cache_fn(I): cache file
+#   return: header and memory-mapped values (None if unavailable)
+# --------------------------------------------------------------------
+def read_cache(cache_fn):
+    try:
+        cache = np.load(cache_fn, mmap_mode='r')
+    except (OSError, ValueError):
+        return None, None
+    if cache.dtype != np.int64 or cache.ndim != 1 or cache.size < HEADER_SIZE or cache[0] != CACHE_MAGIC:
+        return None, None
+    return cache[:HEADER_SIZE].tolist(), cache[HEADER_SIZE:]
+
+
+# --------------------------------------------------------------------
+#   write binary cache file atomically
+#
+#   cache_fn(I): cache file
+#   stat(I): status of instance file
+#   text(I): contents of instance file
+#   data(I): values of instance file
+# --------------------------------------------------------------------
+def write_cache(cache_fn, stat, text, data):
+    cache = np.empty(HEADER_SIZE + len(data), dtype=np.int64)
+    cache[:HEADER_SIZE] = [CACHE_MAGIC, stat.st_mtime_ns, stat.st_size, calc_hash(text)]
+    cache[HEADER_SIZE:] = data
+    tmp_fn = '{}.{}.tmp'.format(cache_fn, os.getpid())
+    try:
+        with open(tmp_fn, 'wb') as cache_file:
+            np.save(cache_file, cache)
+        os.replace(tmp_fn, cache_fn)
+    except OSError:
+        # cache is optional (e.g., read-only directory)
+        if os.path.exists(tmp_fn):
+            os.remove(tmp_fn)
+
+# --------------------------------------------------------------------
+#   end of file
+# --------------------------------------------------------------------
@@ -0,0 +1,266 @@
+#!/usr/local/bin/python3
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+#   Lagrangian relaxation for GAP
+#
+#   Author: Umetani, Shunji <umetani@ist.osaka-u.ac.jp>
+#   Date: 2022/05/18
+# --------------------------------------------------------------------
+
+# import modules -----------------------------------------------------
+import math
+import time
+import gap_log
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# constant -----------------------------------------------------------
+TIME_LIMIT = 10.0  # default time limit for subgradient method
+MAX_ITER = 1000  # default maximum number of subgradient iterations
+INIT_STEP = 2.0  # initial step size factor
+HALF_ITER = 20  # halve step size factor after this number of iterations without improvement
+MIN_STEP = 0.005  # minimum step size factor
+NUM_EPSILON = 0.001  # tolerance for numerical error
+
+# class --------------------------------------------------------------
+
+# --------------------------------------------------------------------
+#   result of Lagrangian relaxation
+# --------------------------------------------------------------------
+class Lagrange:
+    def __init__(self,gap):
+        self.mult = [0.0] * gap.num_job  # u[j]: Lagrangian multiplier of job j giving the best lower bound
+        self.value = -math.inf  # value of Lagrangian relaxation for mult
+        self.lb = -math.inf  # lower bound (rounded up for integer costs)
+        self.ub = math.inf  # objective value of the best solution by Lagrangian heuristic
+        self.sol = None  # best solution by Lagrangian heuristic
+        self.num_iter = 0  # number of subgradient iterations
+        self.int_cost = all(float((gap.cost)[i][j]).is_integer() for i in range(gap.num_agent) for j in (gap.elig_job)[i])  # all costs are integer
+
+    # round up value of Lagrangian relaxation to lower bound --------
+    def bound(self,value):
+        return math.ceil(value - NUM_EPSILON) if self.int_cost else value
+
+
+# function -----------------------------------------------------------
+
+# --------------------------------------------------------------------
+#   solve 0-1 knapsack problem by dynamic programming
+#
+#   profit(I): profit of items
+#   weight(I): integer weight of items
+#   capacity(I): integer capacity
+#   return: optimal value, selected items, best value for each capacity
+# --------------------------------------------------------------------
+def solve_knapsack(profit, weight, capacity):
+    weight = [int(a) for a in weight]
+    capacity = int(capacity)
+    if np is not None:
+        dp = np.zeros(capacity + 1)
+        take = np.zeros((len(profit), capacity + 1), dtype=bool)
+        for k,(p,a) in enumerate(zip(profit, weight)):
+            cand = dp[:capacity+1-a] + p
+            np.greater(cand, dp[a:], out=take[k,a:])
+            np.maximum(dp[a:], cand, out=dp[a:])
+        dp = dp.tolist()
+    else:
+        take = []
+        dp = [0.0] * (capacity + 1)
+        for p,a in zip(profit, weight):
+            t = bytearray(capacity + 1)
+            for w in range(capacity, a - 1, -1):
+                if dp[w-a] + p > dp[w]:
+                    dp[w] = dp[w-a] + p
+                    t[w] = 1
+            take.append(t)
+    # backtrack selected items
+    items = []
+    w = capacity
+    for k in range(len(take) - 1, -1, -1):
+        if take[k][w]:
+            items.append(k)
+            w -= weight[k]
+    return dp[capacity], items, dp
+
+
+# --------------------------------------------------------------------
+#   evaluate Lagrangian relaxation
+#
+#   the assignment constraints are relaxed with multipliers u[j], which
+#   decomposes the problem into a 0-1 knapsack problem for each agent
+#   with profit u[j] - c[i,j]; only items with positive profit are kept
+#
+#   gap(I): GAP data
+#   mult(I): Lagrangian multipliers
+#   return: value, jobs selected by each agent, best knapsack value of
+#           each agent for each capacity
+# --------------------------------------------------------------------
+def eval_lagrange(gap, mult):
+    value = sum(mult)
+    sel = []
+    dps = []
+    for i in range(gap.num_agent):
+        cost, res, cap = (gap.cost)[i], (gap.res)[i], (gap.cap)[i]
+        jobs = [j for j in (gap.elig_job)[i] if mult[j] - cost[j] > 0 and res[j] <= cap]
+        opt, items, dp = solve_knapsack([mult[j] - cost[j] for j in jobs], [res[j] for j in jobs], cap)
+        value -= opt
+        sel.append([jobs[k] for k in items])
+        dps.append(dp)
+    return value, sel, dps
+
+
+# --------------------------------------------------------------------
+#   Lagrangian heuristic
+#
+#   keep each job selected by one or more agents in the cheapest of
+#   them, and assign the remaining jobs in descending order of resource
+#   consumption to the cheapest agent with enough residual capacity
+#
+#   gap(I): GAP data
+#   sel(I): jobs selected by each agent
+#   return: objective value and job assignment to agent (None if failed)
+# --------------------------------------------------------------------
+def repair(gap, sel):
+    sol = [-1] * gap.num_job
+    for i in range(gap.num_agent):
+        for j in sel[i]:
+            if sol[j] < 0 or (gap.cost)[i][j] < (gap.cost)[sol[j]][j]:
+                sol[j] = i
+    resid = list(gap.cap)
+    for j,i in enumerate(sol):
+        if i >= 0:
+            resid[i] -= (gap.res)[i][j]
+    rest = sorted((j for j in range(gap.num_job) if sol[j] < 0), key=lambda j: -min((gap.res)[i][j] for i in (gap.elig_agent)[j]))
+    for j in rest:
+        cand = [i for i in (gap.elig_agent)[j] if (gap.res)[i][j] <= resid[i]]
+        if not cand:
+            return math.inf, None
+        i = min(cand, key=lambda i: (gap.cost)[i][j])
+        sol[j] = i
+        resid[i] -= (gap.res)[i][j]
+    return sum((gap.cost)[i][j] for j,i in enumerate(sol)), sol
+
+
+# --------------------------------------------------------------------
+#   subgradient method for Lagrangian relaxation
+#
+#   gap(I): GAP data
+#   ub(I): upper bound (objective value of a known feasible solution)
+#   time_limit(I): time limit
+#   max_iter(I): maximum number of iterations
+#   return: result of Lagrangian relaxation
+#
+#   raise ValueError if resource consumptions or capacities are not
+#   integer (float values such as 1.0 are accepted)
+# --------------------------------------------------------------------
+def solve_lagrange(gap, ub=math.inf, time_limit=TIME_LIMIT, max_iter=MAX_ITER):
+    int_res = all(float((gap.res)[i][j]).is_integer() for i in range(gap.num_agent) for j in (gap.elig_job)[i])
+    if not int_res or not all(float(b).is_integer() for b in gap.cap):
+        raise ValueError('Lagrangian relaxation needs integer resource consumptions and capacities')
+    lag = Lagrange(gap)
+    lag.ub = ub
+    # initialize multipliers by second smallest cost of each job
+    mult = [sorted((gap.cost)[i][j] for i in agents)[min(1, len(agents)-1)] for j,agents in enumerate(gap.elig_agent)]
+    max_ub = sum(max((gap.cost)[i][j] for i in agents) for j,agents in enumerate(gap.elig_agent))
+
+    # subgradient method
+    start_time = time.time()
+    step = INIT_STEP
+    idle = 0
+    while lag.num_iter < max_iter and time.time() - start_time < time_limit and step > MIN_STEP:
+        lag.num_iter += 1
+        value, sel, _ = eval_lagrange(gap, mult)
+        if value > lag.value + NUM_EPSILON:
+            lag.value, lag.mult = value, mult[:]
+            lag.lb = lag.bound(value)
+            idle = 0
+        else:
+            idle += 1
+            if idle >= HALF_ITER:
+                step /= 2.0
+                idle = 0
+        # Lagrangian heuristic
+        obj, sol = repair(gap, sel)
+        if obj < lag.ub - NUM_EPSILON:
+            lag.ub, lag.sol = obj, sol
+        if lag.lb >= lag.ub - NUM_EPSILON:
+            break
+        # subgradient of assignment constraints
+        grad = [1] * gap.num_job
+        for jobs in sel:
+            for j in jobs:
+                grad[j] -= 1
+        norm = sum(g * g for g in grad)
+        if norm == 0:
+            break
+        t = step * ((lag.ub if lag.ub < math.inf else max_ub) - value) / norm
+        mult = [u + t * g for u,g in zip(mult, grad)]
+    return lag
+
+
+# --------------------------------------------------------------------
+#   reduced-cost variable fixing
+#
+#   forcing x[i,j] = 1 changes the knapsack value of agent i to at most
+#   p[i,j] + dp[i](b[i] - a[i,j]), which gives a lower bound of all
+#   solutions with x[i,j] = 1; x[i,j] is fixed to 0 when this bound
+#   exceeds the upper bound, so every solution whose objective value is
+#   at most the upper bound is kept
+#
+#   gap(I): GAP data
+#   lag(I): result of Lagrangian relaxation
+#   ub(I): upper bound (the best of lag.ub if omitted)
+#   return: free[i][j] (x[i,j] is not fixed to 0 -> True) for eligible
+#           pairs (i,j) (rows are dicts for sparse GAP data)
+# --------------------------------------------------------------------
+def fix_vars(gap, lag, ub=math.inf):
+    ub = min(ub, lag.ub)
+    value, sel, dps = eval_lagrange(gap, lag.mult)
+    free = []
+    for i in range(gap.num_agent):
+        cost, res, cap, dp = (gap.cost)[i], (gap.res)[i], (gap.cap)[i], dps[i]
+        row = {} if gap.sparse else [False] * gap.num_job
+        for j in (gap.elig_job)[i]:
+            if res[j] > cap:
+                row[j] = False
+            elif ub == math.inf:
+                row[j] = True
+            else:
+                row[j] = lag.bound(value + dp[-1] - (lag.mult[j] - cost[j]) - dp[int(cap - res[j])]) <= ub + NUM_EPSILON
+        free.append(row)
+    return free
+
+
+# --------------------------------------------------------------------
+#   number of variables fixed to 0
+#
+#   gap(I): GAP data
+#   free(I): free[i][j] by fix_vars
+#   return: number of eligible pairs (i,j) with x[i,j] fixed to 0
+# --------------------------------------------------------------------
+def num_fixed(gap, free):
+    return sum(1 for i in range(gap.num_agent) for j in (gap.elig_job)[i] if not free[i][j])
+
+
+# --------------------------------------------------------------------
+#   fix variables by Lagrangian relaxation for MIP models
+#
+#   gap(I): GAP data
+#   time_limit(I): time limit for subgradient method
+#   ub(I): upper bound
+#   return: free[i][j] (x[i,j] is not fixed to 0 -> True)
+# --------------------------------------------------------------------
+def fix_vars_lagrange(gap, time_limit, ub=math.inf):
+    lag = solve_lagrange(gap, ub=ub, time_limit=time_limit)
+    free = fix_vars(gap, lag)
+    gap_log.log(gap_log.SUMMARY, '\n[Lagrangian relaxation]')
+    gap_log.log(gap_log.SUMMARY, 'lb= {:g}\tub= {:g}\t#iter= {}', lag.lb, lag.ub, lag.num_iter)
+    gap_log.log(gap_log.SUMMARY, '#fixed vars:\t{}', num_fixed(gap, free))
+    return free
+
+# --------------------------------------------------------------------
+#   end of file
+# --------------------------------------------------------------------
@@ -0,0 +1,59 @@
+#!/usr/local/bin/python3
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+#   logging for GAP solvers
+#
+#   Author: Umetani, Shunji <umetani@ist.osaka-u.ac.jp>
+#   Date: 2022/05/18
+# --------------------------------------------------------------------
+
+# constant -----------------------------------------------------------
+QUIET = 0  # final result only
+SUMMARY = 1  # progress of search
+TRACE = 2  # instance data and details of search
+LEVELS = {'quiet': QUIET, 'summary': SUMMARY, 'trace': TRACE}  # names of log levels
+LOG_LEVEL = 'summary'  # default log level
+
+# current log level
+level = LEVELS[LOG_LEVEL]
+
+# function -----------------------------------------------------------
+
+# --------------------------------------------------------------------
+#   set log level
+#
+#   name(I): name or value of log level
+# --------------------------------------------------------------------
+def set_level(name):
+    global level
+    level = LEVELS[name] if isinstance(name, str) else name
+
+
+# --------------------------------------------------------------------
+#   check log level
+#
+#   lvl(I): log level
+#   return: messages of the level are emitted -> True
+# --------------------------------------------------------------------
+def enabled(lvl):
+    return level >= lvl
+
+
+# --------------------------------------------------------------------
+#   emit message
+#
+#   the message is formatted only when it is emitted; guard the call
+#   with enabled() when computing the arguments is itself expensive
+#
+#   lvl(I): log level
+#   fmt(I): format string
+#   args(I): arguments of format string
+# --------------------------------------------------------------------
+def log(lvl, fmt, *args):
+    if level >= lvl:
+        print(fmt.format(*args) if args else fmt, flush=True)
+
+# --------------------------------------------------------------------
+#   end of file
+# --------------------------------------------------------------------
@@ -0,0 +1,173 @@
+#!/usr/local/bin/python3
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+#   profiler counters for weighting local search
+#
+#   enable() replaces the neighborhood searches and the phases of the
+#   search in the solver module with wrappers counting calls, evaluated
+#   and accepted moves and measuring wall time; nothing is replaced unless enable() is called,
+#   so the search runs at full speed when profiling is off
+#
+#   Author: Umetani, Shunji <umetani@ist.osaka-u.ac.jp>
+#   Date: 2022/05/18
+# --------------------------------------------------------------------
+
+# import modules -----------------------------------------------------
+import time
+import functools
+
+# constant -----------------------------------------------------------
+SEARCHES = ('shift_nb_search', 'shift_nb_search_cand', 'shift_nb_search_np', 'shift_nb_search_best',
+            'swap_nb_search', 'swap_nb_search_pruned', 'swap_nb_search_best', 'chain_nb_search')  # neighborhood searches
+SHIFTS = SEARCHES[:4]  # shift neighborhood searches (called once per pass of local search)
+PHASES = ('init_sol', 'init_weight', 'local_search', 'update_weight')  # other phases of search
+METHODS = ('keep', 'copy', 'restore')  # methods of working data
+
+# profiler state
+enabled = False  # profiler counters are enabled
+phases = {}  # counters of phases by name
+start_time = 0.0  # time when profiler was enabled
+num_merged = 0  # number of worker processes whose counters are merged
+
+# class --------------------------------------------------------------
+
+# --------------------------------------------------------------------
+#   counters of phase
+# --------------------------------------------------------------------
+class Phase:
+    __slots__ = ('calls', 'improved', 'evals', 'moves', 'time')
+
+    def __init__(self):
+        self.calls = 0  # number of calls
+        self.improved = 0  # number of calls finding improved solution
+        self.evals = 0  # number of evaluated moves
+        self.moves = 0  # number of accepted moves
+        self.time = 0.0  # cumulative wall time
+
+
+# function -----------------------------------------------------------
+
+# --------------------------------------------------------------------
+#   wrap neighborhood search
+#
+#   the wrapper is called with (gap, work, cur_work, ...) and counts
+#   evaluated and accepted moves by the counters of cur_work
+# --------------------------------------------------------------------
+def wrap_search(name, func):
+    phase = phases.setdefault(name, Phase())
+    @functools.wraps(func)
+    def wrapper(gap, work, cur_work, *args):
+        num_eval, num_move = cur_work.num_eval, cur_work.num_move
+        start = time.perf_counter()
+        try:
+            result = func(gap, work, cur_work, *args)
+        finally:
+            phase.time += time.perf_counter() - start
+        phase.calls += 1
+        phase.evals += cur_work.num_eval - num_eval
+        phase.moves += cur_work.num_move - num_move
+        if result:
+            phase.improved += 1
+        return result
+    return wrapper
+
+
+# --------------------------------------------------------------------
+#   wrap other phase
+# --------------------------------------------------------------------
+def wrap_phase(name, func):
+    phase = phases.setdefault(name, Phase())
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            phase.time += time.perf_counter() - start
+            phase.calls += 1
+    return wrapper
+
+
+# --------------------------------------------------------------------
+#   enable profiler counters
+#
+#   module(I): module of weighting local search (gap_wls or __main__)
+# --------------------------------------------------------------------
+def enable(module):
+    global enabled, start_time
+    if enabled:
+        return
+    enabled = True
+    start_time = time.perf_counter()
+    for name in SEARCHES:
+        setattr(module, name, wrap_search(name, getattr(module, name)))
+    for name in PHASES:
+        setattr(module, name, wrap_phase(name, getattr(module, name)))
+    for name in METHODS:
+        setattr(module.Work, name, wrap_phase('Work.' + name, getattr(module.Work, name)))
+
+
+# --------------------------------------------------------------------
+#   reset profiler counters
+#
+#   called in a worker process so that the counters inherited from
+#   the parent process are not merged twice
+# --------------------------------------------------------------------
+def reset():
+    for phase in phases.values():
+        phase.calls = phase.improved = phase.evals = phase.moves = 0
+        phase.time = 0.0
+
+
+# --------------------------------------------------------------------
+#   merge profiler counters of worker process
+#
+#   counters(I): counters of phases by name returned by the worker
+# --------------------------------------------------------------------
+def merge(counters):
+    global num_merged
+    for name,other in counters.items():
+        phase = phases.setdefault(name, Phase())
+        phase.calls += other.calls
+        phase.improved += other.improved
+        phase.evals += other.evals
+        phase.moves += other.moves
+        phase.time += other.time
+    num_merged += 1
+
+
+# --------------------------------------------------------------------
+#   display profile table
+#
+#   evaluated moves are read from the counter of the working data,
+#   which the neighborhood searches increase per job or per block; the
+#   time of local_search includes its neighborhood searches; with worker
+#   processes, the counters and times are summed over the workers and
+#   the percentage is taken over the wall time times the workers
+# --------------------------------------------------------------------
+def report():
+    total = time.perf_counter() - start_time
+    scale = max(num_merged, 1)
+    print('\n[profile]')
+    print('phase\t\t\tcalls\timproved\tevals\tmoves\ttime\t%')
+    for name,phase in phases.items():
+        if phase.calls == 0:
+            continue
+        search = name in SEARCHES
+        print('{:<24}{}\t{}\t\t{}\t{}\t{:.3f}\t{:.1f}'.format(
+            name, phase.calls,
+            phase.improved if search else '-',
+            phase.evals if search else '-',
+            phase.moves if search else '-',
+            phase.time, 100.0 * phase.time / max(scale * total, 1e-9)))
+    num_pass = sum(phases[name].calls for name in SHIFTS if name in phases)
+    num_ls = phases['local_search'].calls if 'local_search' in phases else 0
+    num_copy = sum(phases[name].calls for name in ('Work.keep', 'Work.copy') if name in phases)
+    print('restarts of local search: {}\tincumbent copies: {}\ttotal: {:.3f} sec'.format(num_pass - num_ls, num_copy, total))
+    if num_merged > 0:
+        print('worker processes: {}'.format(num_merged))
+
+# --------------------------------------------------------------------
+#   end of file
+# --------------------------------------------------------------------
@@ -12,60 +12,24 @@
 import sys
 import time
 import argparse
+import gap_log
+import gap_lag
+import gap_wls
 from mip import *
 
 # constant -----------------------------------------------------------
 TIME_LIMIT = 60.0  # default time limit for solver
+LAG_TIME_RATIO = 0.1  # ratio of time limit for Lagrangian relaxation
+WARM_TIME_RATIO = 0.0  # default ratio of time limit for weighting local search (0: no MIP start)
+NUM_THREAD = 1  # default number of threads
 
 # class --------------------------------------------------------------
 
 # --------------------------------------------------------------------
-#   GAP data
+#   GAP data (shared with weighting local search, which also reads
+#   sparse instance files)
 # --------------------------------------------------------------------
-class Gap:
-    def __init__(self):
-        self.num_agent = 0  # number of agents
-        self.num_job = 0  # number of jobs
-        self.cost = []  # c[i,j]: cost for assignment of job j to agent i
-        self.res = []  # a[i,j]: resource consumption for assignment of job j to agenet i
-        self.cap = []  # b[i]: resource capacity of agent i
-
-    # read GAP data --------------------------------------------------
-    def read(self, args):
-        # open file and read data
-        input_file = open(args.filename, 'r')
-        data = input_file.read()
-        input_file.close()
-        data = data.split()
-        # initialize GAP data
-        self.num_agent = int(data[0])  # number of agents
-        self.num_job = int(data[1])  # number of jobs
-        self.cost = [[0 for j in range(self.num_job)] for i in range(self.num_agent)]
-        self.res = [[0 for j in range(self.num_job)] for i in range(self.num_agent)]
-        self.cap = [0 for i in range(self.num_agent)]
-        cnt = 2
-        # read cost
-        for i in range(self.num_agent):
-            for j in range(self.num_job):
-                (self.cost)[i][j] = int(data[cnt])
-                cnt +=1
-        # read resource consumption
-        for i in range(self.num_agent):
-            for j in range(self.num_job):
-                (self.res)[i][j] = int(data[cnt])
-                cnt +=1
-        # read resource capacity
-        for i in range(self.num_agent):
-            (self.cap)[i] = int(data[cnt])
-            cnt +=1
-
-    # write GAP data --------------------------------------------------
-    def write(self):
-        print('#agents:\t{}'.format(self.num_agent))
-        print('#jobs:\t\t{}'.format(self.num_job))
-        print('cost:\t{}'.format(self.cost))
-        print('resource:\t{}'.format(self.res))
-        print('capacity:\t{}'.format(self.cap))
+Gap = gap_wls.Gap
 
 
 # --------------------------------------------------------------------
@@ -76,25 +40,49 @@ class Gap:
 #   args(I): arguments
 # --------------------------------------------------------------------
 def solve_mip(gap, sol, args):
-    print('\n[solve MIP model]')
+    gap_log.log(gap_log.SUMMARY, '\n[solve MIP model]')
+
+    time_limit = args.time
+    # initial solution by weighting local search
+    ub, init = float('inf'), None
+    if args.warm > 0.0:
+        start_time = time.time()
+        param = gap_wls.Param()
+        param.read_search(args)
+        ub, init = gap_wls.warm_start(gap, args.warm * time_limit, param)
+        time_limit -= time.time() - start_time
+
+    # fix variables by Lagrangian relaxation
+    free = None
+    if args.fix:
+        start_time = time.time()
+        free = gap_lag.fix_vars_lagrange(gap, LAG_TIME_RATIO * time_limit, ub)
+        time_limit -= time.time() - start_time
 
     # generate model
+    build_time = time.time()
     mip_model = Model()
 
-    # variables
+    # variables (coefficients of objective function are given here)
     x = {}
     for i in range(gap.num_agent):
-        for j in range(gap.num_job):
-            x[i,j] = mip_model.add_var(var_type=BINARY, name='x({},{})'.format(i,j))
+        for j in (gap.elig_job)[i]:
+            if free is None or free[i][j]:
+                x[i,j] = mip_model.add_var(var_type=BINARY, obj=(gap.cost)[i][j], name='x({},{})'.format(i,j) if args.names else '')
 
-    # objective function
-    mip_model.objective = minimize(xsum((gap.cost)[i][j] * x[i,j] for i,j in x))
-
-    # constraints
+    # constraints (built from lists of variables of each agent and job)
     for i in range(gap.num_agent):
-        mip_model.add_constr(xsum((gap.res)[i][j] * x[i,j] for j in range(gap.num_job)) <= (gap.cap)[i])
+        jobs = [j for j in (gap.elig_job)[i] if (i,j) in x]
+        mip_model.add_constr(LinExpr([x[i,j] for j in jobs], [(gap.res)[i][j] for j in jobs]) <= (gap.cap)[i])
     for j in range(gap.num_job):
-        mip_model.add_constr(xsum(x[i,j] for i in range(gap.num_agent)) == 1)
+        agents = [i for i in (gap.elig_agent)[j] if (i,j) in x]
+        mip_model.add_constr(LinExpr([x[i,j] for i in agents], [1] * len(agents)) == 1)
+
+    gap_log.log(gap_log.SUMMARY, 'build time:\t{:.3f} sec', time.time() - build_time)
+
+    # MIP start
+    if init is not None:
+        mip_model.start = [(x[i,j], 1.0) for j,i in enumerate(init) if (i,j) in x]
 
     # write LP file
     #fn_base, fn_ext = os.path.splitext(os.path.basename(args.filename))  # filename and extension
@@ -104,8 +92,9 @@ def solve_mip(gap, sol, args):
     # solve MIP model
     mip_model.max_mip_gap = 0.0  # set relative tolerance for checking optimality
     mip_model.max_mip_gap_abs = 0.0  # set absolute tolerance for checking optimality
-    mip_model.max_seconds=args.time  # time limit for computation
-    mip_model.threads = 1  # number of threads
+    mip_model.max_seconds=time_limit  # time limit for computation
+    mip_model.threads = args.threads  # number of threads
+    mip_model.verbose = 1 if gap_log.enabled(gap_log.SUMMARY) else 0  # display solver log
     mip_model.optimize()
 
     # get solutions
@@ -113,7 +102,6 @@ def solve_mip(gap, sol, args):
         for i,j in x:
             if x[i,j].x > 0.5:
                 sol[j] = i
-    print(sol)
 
 
 # --------------------------------------------------------------------
@@ -125,6 +113,22 @@ def parse_args():
     parser.add_argument('filename', action='store')
     # timelimit for solver
     parser.add_argument('-t', '--time', help='time limit for weighting local search', type=float, default=TIME_LIMIT)
+    # binary cache of instance file
+    parser.add_argument('--no-cache', help='do not use binary cache of instance file', dest='cache', action='store_false')
+    # sparse instance file
+    parser.add_argument('--sparse', help='read sparse instance file of eligible assignments', action='store_true')
+    # variable fixing by Lagrangian relaxation
+    parser.add_argument('--fix', help='fix variables to 0 by reduced costs of Lagrangian relaxation', action='store_true')
+    # names of variables
+    parser.add_argument('--names', help='give names to variables (slower model construction)', action='store_true')
+    # MIP start by weighting local search
+    parser.add_argument('-w', '--warm', help='ratio of time limit for weighting local search giving MIP start', type=float, default=WARM_TIME_RATIO)
+    # options of weighting local search giving MIP start
+    gap_wls.add_search_args(parser)
+    # number of threads
+    parser.add_argument('-p', '--threads', help='number of threads', type=int, default=NUM_THREAD)
+    # log level
+    parser.add_argument('-l', '--log', help='log level', choices=list(gap_log.LEVELS), default=gap_log.LOG_LEVEL)
     return parser.parse_args()
 
 # --------------------------------------------------------------------
@@ -133,6 +137,7 @@ def parse_args():
 def main(argv=sys.argv):
     # parse arguments
     args = parse_args()
+    gap_log.set_level(args.log)
 
     # set starting time
     start_time = time.time()
@@ -140,17 +145,19 @@ def main(argv=sys.argv):
     # read instance
     gap = Gap()
     gap.read(args)
-    gap.write()
+    if gap_log.enabled(gap_log.TRACE):
+        gap.write()
 
     # solve GAP
     sol = [None for _ in range(gap.num_job)]
     solve_mip(gap,sol,args)
+    print(sol)
 
     # set completion time
     end_time = time.time()
 
     # display computation time
-    print('\nTotal time:\t%.3f sec' % (end_time - start_time))
+    gap_log.log(gap_log.SUMMARY, '\nTotal time:\t{:.3f} sec', end_time - start_time)
 
 # main ---------------------------------------------------------------
 if __name__ == "__main__":
@@ -9,19 +9,49 @@
 # --------------------------------------------------------------------
 
 # import modules -----------------------------------------------------
+import os
 import sys
 import time
 import random
+import bisect
+import heapq
 import argparse
 import copy
+import multiprocessing
+import gap_io
+import gap_log
+import gap_lag
+import gap_event
+import gap_prof
+import gap_ckpt
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # constant -----------------------------------------------------------
 TIME_LIMIT = 60  # default time limit for iterated local search
 INTVL_TIME = 1.0  # interval time for display logs
+CKPT_INTVL = 5.0  # interval time for writing checkpoint
 RANDOM_SEED = 0  # default random seed
 NUM_EPSILON = 0.001  # tolerance for numerical error
 INC_WT_RATIO = 0.2  # ratio of increasing penalty weight
 DEC_WT_RATIO = 0.1  # ratio of decreasing penalty weight
+ENGINE = 'python'  # default engine for shift neighborhood search
+NUM_WORKER = 1  # default number of worker processes
+SWAP_NB = 'full'  # default swap neighborhood search
+CHAIN_DEPTH = 0  # default maximum number of shifts in ejection chain (0: off)
+CHAIN_WIDTH = 3  # number of cheapest unvisited agents to which a job is shifted in the middle of ejection chain
+CHAIN_EJECT = 3  # number of jobs with the largest resource consumption ejected from an agent in ejection chain
+CHAIN_EVALS = 50000  # maximum number of evaluated chains in one ejection chain neighborhood search
+LAG_TIME_RATIO = 0.1  # ratio of time limit for Lagrangian relaxation
+INIT = 'random'  # default construction of initial solution
+YIELD_DECAY = 0.9  # decay of gain and evaluated moves of neighborhood searches for adaptive scheduling
+SKIP_RATIO = 0.1  # skip neighborhood search whose yield is below this ratio of the best yield
+MAX_SKIP = 10  # maximum number of consecutive local searches skipping a neighborhood search
+IMPROVE = 'first'  # default move selection of shift and swap neighborhood searches
+TOP_K = 1  # default number of best improving moves to choose from in best-improvement
+SWAP_BLOCK = 65536  # number of swap moves evaluated at once in best-improvement swap
 
 # class --------------------------------------------------------------
 
@@ -35,35 +65,125 @@ class Gap:
         self.cost = []  # c[i,j]: cost for assignment of job j to agent i
         self.res = []  # a[i,j]: resource consumption for assignment of job j to agenet i
         self.cap = []  # b[i]: resource capacity of agent i
+        self.sparse = False  # rows of cost and res are dicts {j: value} of eligible jobs
+        self.elig_agent = []  # eligible agents for each job (in ascending order)
+        self.elig_job = []  # eligible jobs for each agent (in ascending order)
+        self.cost_t = None  # c[j,i]: transposed cost as NumPy array (numpy engine)
+        self.res_t = None  # a[j,i]: transposed resource consumption as NumPy array (numpy engine)
+        self.cap_a = None  # b[i]: resource capacity as NumPy array (numpy engine)
+        self.res_order = None  # jobs in ascending order of resource consumption for each agent (pruned swap)
+        self.res_sorted = None  # resource consumption in ascending order for each agent (pruned swap)
+        self.cost_order = None  # agents in ascending order of cost for each job (ejection chain)
 
     # read GAP data --------------------------------------------------
     def read(self, args):
-        # open file and read data
-        input_file = open(args.filename, 'r')
-        data = input_file.read()
-        input_file.close()
-        data = data.split()
-        # initialize GAP data
-        self.num_agent = int(data[0])  # number of agents
-        self.num_job = int(data[1])  # number of jobs
-        self.cost = [[0 for j in range(self.num_job)] for i in range(self.num_agent)]
-        self.res = [[0 for j in range(self.num_job)] for i in range(self.num_agent)]
-        self.cap = [0 for i in range(self.num_agent)]
-        cnt = 2
-        # read cost
-        for i in range(self.num_agent):
-            for j in range(self.num_job):
-                (self.cost)[i][j] = int(data[cnt])
-                cnt +=1
-        # read resource consumption
-        for i in range(self.num_agent):
-            for j in range(self.num_job):
-                (self.res)[i][j] = int(data[cnt])
-                cnt +=1
-        # read resource capacity
-        for i in range(self.num_agent):
-            (self.cap)[i] = int(data[cnt])
-            cnt += 1
+        self.read_file(args.filename, args.cache, args.sparse)
+
+    # read GAP data from instance file -------------------------------
+    def read_file(self, filename, cache=True, sparse=False):
+        read = gap_io.read_sparse if sparse else gap_io.read_gap
+        self.num_agent, self.num_job, self.cost, self.res, self.cap = read(filename, cache)
+        self.sparse = sparse
+        self.make_elig()
+        return self
+
+    # GAP data from arrays -------------------------------------------
+    #   cost(I): c[i,j] (m x n nested sequence or NumPy array)
+    #   res(I): a[i,j] (m x n nested sequence or NumPy array)
+    #   cap(I): b[i] (sequence or NumPy array of length m)
+    @classmethod
+    def from_arrays(cls, cost, res, cap):
+        gap = cls()
+        gap.cost = [list(row) for row in (cost.tolist() if hasattr(cost, 'tolist') else cost)]
+        gap.res = [list(row) for row in (res.tolist() if hasattr(res, 'tolist') else res)]
+        gap.cap = list(cap.tolist() if hasattr(cap, 'tolist') else cap)
+        gap.num_agent = len(gap.cap)
+        gap.num_job = len(gap.cost[0]) if gap.cost else 0
+        if len(gap.cost) != gap.num_agent or len(gap.res) != gap.num_agent or any(len(row) != gap.num_job for row in gap.cost + gap.res):
+            raise ValueError('cost and res must be {} x {} arrays'.format(gap.num_agent, gap.num_job))
+        gap.make_elig()
+        return gap
+
+    # sparse GAP data from eligible pairs ----------------------------
+    #   num_agent(I): number of agents
+    #   num_job(I): number of jobs
+    #   pairs(I): eligible pairs (i, j, c[i,j], a[i,j])
+    #   cap(I): b[i]
+    @classmethod
+    def from_sparse(cls, num_agent, num_job, pairs, cap):
+        gap = cls()
+        gap.num_agent, gap.num_job, gap.sparse = num_agent, num_job, True
+        gap.cost = [{} for _ in range(num_agent)]
+        gap.res = [{} for _ in range(num_agent)]
+        for i,j,c,a in pairs:
+            (gap.cost)[i][j], (gap.res)[i][j] = c, a
+        gap.cap = list(cap)
+        if len(gap.cap) != num_agent:
+            raise ValueError('cap must have {} values'.format(num_agent))
+        gap.make_elig()
+        return gap
+
+    # append job -----------------------------------------------------
+    #   cost(I): c[i,j] (sequence of m values, or dict {i: value} of
+    #            eligible agents for sparse GAP data)
+    #   res(I): a[i,j] (the same as cost)
+    def append_job(self, cost, res):
+        j = self.num_job
+        self.num_job += 1
+        if not self.sparse:
+            for i in range(self.num_agent):
+                (self.cost)[i].append(cost[i])
+                (self.res)[i].append(res[i])
+            self.make_elig()
+            return
+        if not cost:
+            raise ValueError('job {} has no eligible agent'.format(j))
+        for i in cost:
+            (self.cost)[i][j], (self.res)[i][j] = cost[i], res[i]
+            (self.elig_job)[i].append(j)
+        self.elig_agent.append(sorted(cost))
+
+    # delete job -----------------------------------------------------
+    #   the last job is renumbered to j
+    #   j(I): job
+    def delete_job(self, j):
+        last = self.num_job - 1
+        self.num_job -= 1
+        if not self.sparse:
+            for i in range(self.num_agent):
+                (self.cost)[i][j] = (self.cost)[i][last]
+                (self.res)[i][j] = (self.res)[i][last]
+                del (self.cost)[i][last], (self.res)[i][last]
+            self.make_elig()
+            return
+        agents = set((self.elig_agent)[j]) | set((self.elig_agent)[last])
+        for i in agents:
+            cost, res = (self.cost)[i], (self.res)[i]
+            cost.pop(j, None)
+            res.pop(j, None)
+            if last in cost:
+                cost[j], res[j] = cost.pop(last), res.pop(last)
+            (self.elig_job)[i] = sorted(cost)
+        (self.elig_agent)[j] = (self.elig_agent)[last]
+        self.elig_agent.pop()
+
+    # make lists of eligible agents and jobs -------------------------
+    #   all assignments are eligible for dense GAP data, whose lists
+    #   are shared among jobs and agents
+    def make_elig(self):
+        if not self.sparse:
+            agents, jobs = list(range(self.num_agent)), range(self.num_job)
+            self.elig_agent = [agents] * self.num_job
+            self.elig_job = [jobs] * self.num_agent
+            return
+        self.elig_job = [sorted(row) for row in self.cost]
+        self.elig_agent = [[] for _ in range(self.num_job)]
+        for i,jobs in enumerate(self.elig_job):
+            for j in jobs:
+                (self.elig_agent)[j].append(i)
+        for j,agents in enumerate(self.elig_agent):
+            if not agents:
+                raise ValueError('job {} has no eligible agent'.format(j))
 
     # write GAP data --------------------------------------------------
     def write(self):
@@ -73,18 +193,246 @@ class Gap:
         print('resource:\t{}'.format(self.res))
         print('capacity:\t{}'.format(self.cap))
 
+    # make NumPy arrays for numpy engine -----------------------------
+    def make_array(self):
+        # job-major layout so that the scan order (j,i) is row-major
+        self.cost_t = np.ascontiguousarray(np.array(self.cost, dtype=np.float64).T)
+        self.res_t = np.ascontiguousarray(np.array(self.res, dtype=np.float64).T)
+        self.cap_a = np.array(self.cap, dtype=np.float64)
+
+    # sort jobs by resource consumption for pruned swap --------------
+    def make_res_order(self):
+        self.res_order = [sorted((self.elig_job)[i], key=(self.res)[i].__getitem__) for i in range(self.num_agent)]
+        self.res_sorted = [[(self.res)[i][j] for j in (self.res_order)[i]] for i in range(self.num_agent)]
+
+    # sort agents by cost for ejection chain -------------------------
+    def make_cost_order(self):
+        self.cost_order = [sorted((self.elig_agent)[j], key=lambda i: (self.cost)[i][j]) for j in range(self.num_job)]
+
+
+# --------------------------------------------------------------------
+#   parameters
+# --------------------------------------------------------------------
+class Param:
+    def __init__(self):
+        self.engine = ENGINE  # engine for shift neighborhood search ('python' or 'numpy')
+        self.seed = RANDOM_SEED  # random seed
+        self.inc_wt_ratio = INC_WT_RATIO  # ratio of increasing penalty weight
+        self.dec_wt_ratio = DEC_WT_RATIO  # ratio of decreasing penalty weight
+        self.cand_list = False  # use candidate list for shift neighborhood search
+        self.swap_nb = SWAP_NB  # swap neighborhood search ('full' or 'pruned')
+        self.swap_bound = False  # skip swaps by lower bound of difference in pruned swap
+        self.chain_depth = CHAIN_DEPTH  # maximum number of shifts in ejection chain (0: off)
+        self.init = INIT  # construction of initial solution ('random', 'greedy' or 'regret')
+        self.lag = False  # compute lower bound by Lagrangian relaxation
+        self.lower_bound = None  # lower bound computed in advance (parallel search)
+        self.num_worker = NUM_WORKER  # number of worker processes
+        self.shared_obj = None  # best objective value shared among worker processes
+        self.observer = None  # callable receiving events of search (None: no events)
+        self.event_intvl = INTVL_TIME  # interval of periodic 'stat' events
+        self.checkpoint = None  # checkpoint file (None: no checkpoint)
+        self.ckpt_intvl = CKPT_INTVL  # interval time for writing checkpoint
+        self.resume = False  # resume search from checkpoint file if exists
+        self.trace = False  # record trace of improvements of incumbent solution
+        self.target = None  # stop when feasible solution attains this objective value (None: no target)
+        self.adaptive = False  # schedule neighborhood searches adaptively by their yield
+        self.improve = IMPROVE  # move selection of shift and swap neighborhood searches ('first' or 'best')
+        self.top_k = TOP_K  # choose randomly among this number of best improving moves (best-improvement)
+
+    # set parameters from dictionary --------------------------------
+    def update(self, params):
+        for key,value in params.items():
+            if key.startswith('_') or not hasattr(self, key):
+                raise ValueError('unknown parameter: {}'.format(key))
+            setattr(self, key, value)
+        self.check()
+        return self
+
+    # set parameters from arguments ----------------------------------
+    def read(self, args):
+        self.read_search(args)
+        self.lag = args.lag
+        self.num_worker = args.workers
+        if args.events is not None:
+            self.observer = gap_event.EventStream(args.events)
+        self.checkpoint = args.checkpoint
+        self.ckpt_intvl = args.ckpt_intvl
+        self.resume = args.resume
+        self.check()
+
+    # set parameters of search from arguments of add_search_args -----
+    def read_search(self, args):
+        self.engine = args.engine
+        self.cand_list = args.cand_list
+        self.swap_nb = args.swap
+        self.swap_bound = args.swap_bound
+        self.chain_depth = args.chain
+        self.init = args.init
+        self.improve = args.improve
+        self.top_k = args.top_k
+        self.adaptive = args.adaptive
+        self.check()
+
+    # check and adjust parameters ------------------------------------
+    def check(self):
+        self.top_k = max(1, self.top_k)
+        if self.checkpoint is not None and self.num_worker > 1:
+            gap_log.log(gap_log.QUIET, 'Checkpoint is not supported by parallel search; ignored.')
+            self.checkpoint = None
+        if self.engine == 'numpy' and np is None:
+            gap_log.log(gap_log.QUIET, 'NumPy is not available; falling back to python engine.')
+            self.engine = 'python'
+
+
+# --------------------------------------------------------------------
+#   statistics of search
+# --------------------------------------------------------------------
+class Stat:
+    def __init__(self):
+        self.num_iter = 0  # number of iterations
+        self.best_time = 0.0  # time to obtain the best solution
+        self.first_time = None  # time to obtain the first feasible solution (None: not found)
+        self.num_move = 0  # number of shift and swap moves applied to current solution
+        self.lower_bound = float('-inf')  # lower bound by Lagrangian relaxation
+        self.total_time = 0.0  # computation time
+        self.trace = []  # (time, iteration, objective value) of improved feasible solutions (param.trace)
+
+
+# --------------------------------------------------------------------
+#   result of solver
+# --------------------------------------------------------------------
+class Result:
+    def __init__(self,work,stat):
+        self.sol = list(work.sol)  # job assignment to agent of the best solution
+        self.obj = work.obj  # objective value
+        self.feasible = work.plt < NUM_EPSILON  # solution satisfies capacity constraints
+        self.lower_bound = stat.lower_bound  # lower bound by Lagrangian relaxation (-inf: not computed)
+        self.num_iter = stat.num_iter  # number of iterations
+        self.num_move = stat.num_move  # number of shift and swap moves
+        self.first_time = stat.first_time  # time to obtain the first feasible solution
+        self.best_time = stat.best_time  # time to obtain the best solution
+        self.total_time = stat.total_time  # computation time
+        self.trace = stat.trace  # (time, iteration, objective value) of improved feasible solutions
+
+
+# --------------------------------------------------------------------
+#   weighting local search solver for embedding
+#
+#   a solver keeps GAP data and parameters, and solves the GAP data
+#   as it is when solve() is called; modify the GAP data in place (or
+#   replace solver.gap) to re-solve without reading the instance file
+#
+#   solver = Solver(Gap.from_arrays(cost, res, cap), {'init': 'regret'})
+#   result = solver.solve(time_limit=10.0, seed=1)
+#
+#   after solve(), add_job(), remove_job() and set_cap() change the GAP
+#   data and patch the last incumbent and current solutions in place,
+#   and resolve() continues the search from them with the penalty
+#   weights of the last search
+# --------------------------------------------------------------------
+class Solver:
+    def __init__(self,gap,params=None,log=gap_log.QUIET):
+        self.gap = gap  # GAP data
+        self.param = Param().update(params or {})  # parameters
+        self.log = log  # log level during search
+        self.work = None  # working data of the last solution
+        self.cur_work = None  # current working data of the last search (None: parallel search)
+
+    # solve GAP ------------------------------------------------------
+    #   time_limit(I): time limit
+    #   seed(I): random seed (None: seed of parameters)
+    #   params(I): parameters overriding those of solver
+    #   return: result
+    def solve(self,time_limit=TIME_LIMIT,seed=None,params=None):
+        param = copy.copy(self.param).update(params or {})
+        if seed is not None:
+            param.seed = seed
+        level = gap_log.level
+        gap_log.set_level(self.log)
+        try:
+            random.seed(param.seed)
+            work = Work(self.gap)
+            cur_work = None
+            if param.num_worker > 1:
+                stat = parallel_weight_local_search(self.gap, work, time_limit, param)
+            else:
+                cur_work = Work(self.gap)
+                init_work(self.gap, work, cur_work, param.init)
+                stat = weight_local_search(self.gap, work, time_limit, param, cur_work)
+        finally:
+            gap_log.set_level(level)
+        self.work, self.cur_work = work, cur_work
+        return Result(work, stat)
+
+    # re-solve GAP from the last search ------------------------------
+    #   time_limit(I): time limit
+    #   params(I): parameters overriding those of solver
+    #   return: result
+    def resolve(self,time_limit=TIME_LIMIT,params=None):
+        if self.cur_work is None:
+            return self.solve(time_limit, params=params)
+        param = copy.copy(self.param).update(params or {})
+        param.num_worker = 1
+        level = gap_log.level
+        gap_log.set_level(self.log)
+        try:
+            stat = weight_local_search(self.gap, self.work, time_limit, param, self.cur_work)
+        finally:
+            gap_log.set_level(level)
+        return Result(self.work, stat)
+
+    # working data to be patched -------------------------------------
+    def _works(self):
+        return [work for work in (self.work, self.cur_work) if work is not None]
+
+    # add job --------------------------------------------------------
+    #   cost(I): c[i,j] (sequence of m values, or dict {i: value} of
+    #            eligible agents for sparse GAP data)
+    #   res(I): a[i,j] (the same as cost)
+    #   return: new job (index num_job - 1)
+    def add_job(self,cost,res):
+        self.gap.append_job(cost, res)
+        j = self.gap.num_job - 1
+        for work in self._works():
+            work.append_job(self.gap, select_agent(self.gap, work, j))
+        return j
+
+    # remove job -----------------------------------------------------
+    #   the last job is renumbered to j
+    #   j(I): job
+    def remove_job(self,j):
+        for work in self._works():
+            work.delete_job(self.gap, j)
+        self.gap.delete_job(j)
+
+    # change capacity ------------------------------------------------
+    #   i(I): agent
+    #   cap(I): new capacity
+    def set_cap(self,i,cap):
+        old_cap, (self.gap.cap)[i] = (self.gap.cap)[i], cap
+        for work in self._works():
+            work.change_cap(self.gap, i, old_cap)
+
 
 # --------------------------------------------------------------------
 #   working data
 # --------------------------------------------------------------------
 class Work:
+    __slots__ = ('sol', 'wt', 'obj', 'used', 'plt', 'job', 'pos', 'vio', 'max_vio', 'dlb', 'num_move', 'num_eval')
+
     def __init__(self,gap):
-        self.sol = [None for _ in range(gap.num_job)]  # job assignment to agent
-        self.wt = [1.0 for _ in range(gap.num_agent)]  # penalty weight for capacity constraint
+        self.sol = [-1] * gap.num_job  # job assignment to agent
+        self.wt = [1.0] * gap.num_agent  # penalty weight for capacity constraint
         self.obj = 0.0  # objective value
-        self.used = [0 for _ in range(gap.num_agent)]  # used resource for agent
+        self.used = [0] * gap.num_agent  # used resource for agent
         self.plt = 0.0  # weighted penalty
-        self.job = [set() for _ in range(gap.num_agent)]  # set of jobs assigned to each agent
+        self.job = [[] for _ in range(gap.num_agent)]  # list of jobs assigned to each agent (in no order; swap searches scan it sorted)
+        self.pos = [-1] * gap.num_job  # position of job j in job[sol[j]]
+        self.vio = set()  # set of agents violating capacity constraint
+        self.max_vio = 0  # maximum overload of agents
+        self.dlb = None  # don't-look bits of jobs for candidate list (bytearray)
+        self.num_move = 0  # number of shift and swap moves applied (not copied)
+        self.num_eval = 0  # number of moves evaluated by neighborhood searches, counted per job or per block (not copied)
 
     # copy -----------------------------------------------------------
     def copy(self,org):
@@ -93,7 +441,28 @@ class Work:
         self.obj = org.obj
         self.used = org.used[:]
         self.plt = org.plt
-        self.job = copy.deepcopy(org.job)
+        self.job = [jobs[:] for jobs in org.job]
+        self.pos = org.pos[:]
+        self.vio = set(org.vio)
+        self.max_vio = org.max_vio
+        self.dlb = None if org.dlb is None else bytearray(org.dlb)
+
+    # keep solution obtained from org by shifting jobs --------------
+    #   only sol and obj are recorded; call restore() before using
+    #   used, plt and job of the incumbent solution
+    def keep(self,org,obj,moves):
+        self.sol = org.sol[:]
+        for j,i in moves:
+            (self.sol)[j] = i
+        self.obj = obj
+        self.plt = 0.0
+
+    # restore working data from solution ----------------------------
+    def restore(self,gap):
+        self.calc_obj(gap)
+        self.calc_used(gap)
+        self.calc_plt(gap)
+        self.calc_job(gap)
 
     # calculate objective value --------------------------------------
     def calc_obj(self,gap):
@@ -112,17 +481,149 @@ class Work:
 
     # calculate weighted penalty -------------------------------------
     def calc_plt(self,gap):
-        self.plt = 0.0
+        self.vio.clear()
+        self.max_vio = 0
         for i in range(gap.num_agent):
-            self.plt += (self.wt)[i] * max(0, (self.used)[i] - (gap.cap)[i])
+            if (self.used)[i] > (gap.cap)[i]:
+                self.vio.add(i)
+                self.max_vio = max(self.max_vio, (self.used)[i] - (gap.cap)[i])
+        self.sum_plt(gap)
+
+    # sum up weighted penalty over violating agents ------------------
+    def sum_plt(self,gap):
+        self.plt = 0.0
+        for i in self.vio:
+            self.plt += (self.wt)[i] * ((self.used)[i] - (gap.cap)[i])
 
-    # calculate set of jobs assigned to each agent -------------------
+    # update used resource of agent i and weighted penalty -----------
+    def update_used(self,gap,i,delta):
+        cur_vio = (self.used)[i] - (gap.cap)[i]
+        new_vio = cur_vio + delta
+        (self.used)[i] += delta
+        if new_vio <= 0 and cur_vio <= 0:
+            return
+        self.plt += (self.wt)[i] * (max(0, new_vio) - max(0, cur_vio))
+        if new_vio > 0:
+            self.vio.add(i)
+            if new_vio > self.max_vio:
+                self.max_vio = new_vio
+        else:
+            self.vio.discard(i)
+            if not self.vio:
+                self.plt = 0.0  # cancel accumulated numerical error
+        if cur_vio == self.max_vio and new_vio < cur_vio:
+            self.max_vio = max(((self.used)[h] - (gap.cap)[h] for h in self.vio), default=0)
+
+    # calculate list of jobs assigned to each agent ------------------
     def calc_job(self,gap):
         for i in range(gap.num_agent):
-            (self.job)[i].clear()
+            del (self.job)[i][:]
         for j in range(gap.num_job):
-            i = (self.sol)[j]
-            (self.job)[i].add(j)
+            self.add_job((self.sol)[j],j)
+
+    # add job j to list of agent i -----------------------------------
+    def add_job(self,i,j):
+        (self.pos)[j] = len((self.job)[i])
+        (self.job)[i].append(j)
+
+    # remove job j from list of agent i (swap with last job) --------
+    def remove_job(self,i,j):
+        jobs = (self.job)[i]
+        last = jobs.pop()
+        if last != j:
+            k = (self.pos)[j]
+            jobs[k] = last
+            (self.pos)[last] = k
+
+    # shift job j to agent i ----------------------------------------
+    def shift(self,gap,j,i):
+        sol, pos, job = self.sol, self.pos, self.job
+        i1,i2 = sol[j],i
+        sol[j] = i2
+        self.num_move += 1
+        self.update_used(gap, i1, -(gap.res)[i1][j])
+        self.update_used(gap, i2, (gap.res)[i2][j])
+        self.obj += (gap.cost)[i2][j] - (gap.cost)[i1][j]
+        # remove job j from agent i1 (swap with last job) and add it to agent i2
+        last = job[i1].pop()
+        if last != j:
+            job[i1][pos[j]] = last
+            pos[last] = pos[j]
+        pos[j] = len(job[i2])
+        job[i2].append(j)
+        # turn on don't-look bits of jobs on both agents
+        if self.dlb is not None:
+            self.wake(i1)
+            self.wake(i2)
+
+    # swap agents of jobs j1 and j2 ----------------------------------
+    def swap(self,gap,j1,j2):
+        i1,i2 = (self.sol)[j1],(self.sol)[j2]
+        (self.sol)[j1], (self.sol)[j2] = i2, i1
+        self.num_move += 1
+        self.update_used(gap, i1, (gap.res)[i1][j2] - (gap.res)[i1][j1])
+        self.update_used(gap, i2, (gap.res)[i2][j1] - (gap.res)[i2][j2])
+        self.obj += (gap.cost)[i2][j1] + (gap.cost)[i1][j2] - (gap.cost)[i1][j1] - (gap.cost)[i2][j2]
+        self.remove_job(i1,j1)
+        self.add_job(i2,j1)
+        self.remove_job(i2,j2)
+        self.add_job(i1,j2)
+        # turn on don't-look bits of jobs on both agents
+        if self.dlb is not None:
+            self.wake(i1)
+            self.wake(i2)
+
+    # append new job j = num_job - 1 assigned to agent i -----------
+    #   gap(I): GAP data with the new job
+    def append_job(self,gap,i):
+        j = len(self.sol)
+        self.sol.append(i)
+        self.pos.append(-1)
+        self.add_job(i,j)
+        self.update_used(gap, i, (gap.res)[i][j])
+        self.obj += (gap.cost)[i][j]
+        if self.dlb is not None:
+            self.dlb.append(1)
+
+    # delete job j and renumber the last job to j --------------------
+    #   gap(I): GAP data before deleting job j
+    def delete_job(self,gap,j):
+        i = (self.sol)[j]
+        self.update_used(gap, i, -(gap.res)[i][j])
+        self.obj -= (gap.cost)[i][j]
+        self.remove_job(i,j)
+        last = len(self.sol) - 1
+        if last != j:
+            h = (self.sol)[last]
+            (self.sol)[j], (self.pos)[j] = h, (self.pos)[last]
+            (self.job)[h][(self.pos)[j]] = j
+            if self.dlb is not None:
+                (self.dlb)[j] = (self.dlb)[last]
+        self.sol.pop()
+        self.pos.pop()
+        if self.dlb is not None:
+            self.dlb.pop()
+
+    # update weighted penalty for changed capacity of agent i --------
+    #   gap(I): GAP data with the new capacity
+    #   old_cap(I): previous capacity
+    def change_cap(self,gap,i,old_cap):
+        cur_vio = (self.used)[i] - old_cap
+        new_vio = (self.used)[i] - (gap.cap)[i]
+        self.plt += (self.wt)[i] * (max(0, new_vio) - max(0, cur_vio))
+        if new_vio > 0:
+            self.vio.add(i)
+        else:
+            self.vio.discard(i)
+            if not self.vio:
+                self.plt = 0.0  # cancel accumulated numerical error
+        self.max_vio = max(((self.used)[h] - (gap.cap)[h] for h in self.vio), default=0)
+
+    # turn on don't-look bits of jobs on agent i ---------------------
+    def wake(self,i):
+        dlb = self.dlb
+        for j in (self.job)[i]:
+            dlb[j] = 1
 
     # average penalty weight -----------------------------------------
     def avg_wt(self,gap):
@@ -146,18 +647,127 @@ class Work:
         #print('plt= {:g}'.format(self.plt))
 
 
+# --------------------------------------------------------------------
+#   adaptive scheduler of neighborhood searches
+#
+#   the yield of a neighborhood search is the decrease of the penalized
+#   objective value (obj + plt) of the current solution per evaluated
+#   move, where the gain and evaluations of past calls decay by
+#   YIELD_DECAY per call; the yield does not depend on timing, so the
+#   search follows the same trajectory for the same random seed, and
+#   the time of each neighborhood search is measured for display only;
+#   neighborhood searches are tried in descending order of yield
+#   (untried ones first), and one whose yield is below SKIP_RATIO of
+#   the best yield is skipped in up to MAX_SKIP consecutive local
+#   searches
+# --------------------------------------------------------------------
+class Sched:
+    def __init__(self,names):
+        self.names = list(names)  # neighborhood searches in the default order
+        self.calls = {nb: 0 for nb in names}  # number of calls
+        self.gain = {nb: 0.0 for nb in names}  # decayed decrease of penalized objective value
+        self.evals = {nb: 0.0 for nb in names}  # decayed number of evaluated moves
+        self.total_gain = {nb: 0.0 for nb in names}  # total decrease of penalized objective value
+        self.total_evals = {nb: 0 for nb in names}  # total number of evaluated moves
+        self.total_time = {nb: 0.0 for nb in names}  # total time (display only)
+        self.skip = {nb: 0 for nb in names}  # number of consecutive local searches skipping the neighborhood
+
+    # yield of neighborhood search (inf: not tried yet) -------------
+    def rate(self,nb):
+        if (self.calls)[nb] == 0:
+            return float('inf')
+        return (self.gain)[nb] / max((self.evals)[nb], 1.0)
+
+    # neighborhood searches in descending order of yield -------------
+    def order(self):
+        return sorted(self.names, key=lambda nb: -self.rate(nb))
+
+    # neighborhood searches used in next local search ----------------
+    def active(self):
+        best = max((rate for rate in map(self.rate, self.names) if rate < float('inf')), default=0.0)
+        active = []
+        for nb in self.names:
+            if self.rate(nb) < SKIP_RATIO * best and (self.skip)[nb] < MAX_SKIP:
+                (self.skip)[nb] += 1
+            else:
+                (self.skip)[nb] = 0
+                active.append(nb)
+        return active
+
+    # record result of neighborhood search ---------------------------
+    def update(self,nb,gain,evals,elapsed):
+        (self.calls)[nb] += 1
+        (self.gain)[nb] = YIELD_DECAY * (self.gain)[nb] + gain
+        (self.evals)[nb] = YIELD_DECAY * (self.evals)[nb] + evals
+        (self.total_gain)[nb] += gain
+        (self.total_evals)[nb] += evals
+        (self.total_time)[nb] += elapsed
+
+    # write statistics -----------------------------------------------
+    def write(self):
+        gap_log.log(gap_log.SUMMARY, '\n[neighborhood yield]')
+        for nb in self.names:
+            gap_log.log(gap_log.SUMMARY, '{}\tcalls= {}\tgain= {:g}\tevals= {}\ttime= {:.3f} sec\tgain/eval= {:g}\tgain/sec= {:g}', nb, (self.calls)[nb],
+                        (self.total_gain)[nb], (self.total_evals)[nb], (self.total_time)[nb],
+                        (self.total_gain)[nb] / max((self.total_evals)[nb], 1), (self.total_gain)[nb] / max((self.total_time)[nb], 1e-9))
+
+
 # function -----------------------------------------------------------
 
+# --------------------------------------------------------------------
+#   initialize working data
+#
+#   gap(I): GAP data
+#   work(O): working data of incumbent solution
+#   cur_work(O): current working data
+#   init(I): construction of initial solution
+# --------------------------------------------------------------------
+def init_work(gap,work,cur_work,init=INIT):
+    # generate initial solution
+    init_sol(gap,work,init)
+
+    # initialize current working data
+    cur_work.copy(work)
+
+    # initialize penalty weight
+    init_weight(gap, cur_work)
+
+
+# --------------------------------------------------------------------
+#   select agent for a new job
+#
+#   the cheapest eligible agent with enough residual capacity, or the
+#   eligible agent with the smallest overload if no agent has
+#
+#   gap(I): GAP data
+#   work(I): working data
+#   j(I): job
+#   return: agent
+# --------------------------------------------------------------------
+def select_agent(gap,work,j):
+    cost, res, cap, used = gap.cost, gap.res, gap.cap, work.used
+    agents = (gap.elig_agent)[j]
+    fit = [i for i in agents if used[i] + res[i][j] <= cap[i]]
+    if fit:
+        return min(fit, key=lambda i: cost[i][j])
+    return min(agents, key=lambda i: used[i] + res[i][j] - cap[i])
+
+
 # --------------------------------------------------------------------
 #   initialize solution
 #
 #   gap(I): GAP data
 #   work(I/O): working data
+#   init(I): construction of initial solution
 # --------------------------------------------------------------------
-def init_sol(gap,work):
-    # random assignment
-    for j in range(gap.num_job):
-        (work.sol)[j] = random.randrange(0,gap.num_agent)
+def init_sol(gap,work,init=INIT):
+    if init == 'random':
+        # random assignment
+        for j in range(gap.num_job):
+            (work.sol)[j] = random.choice((gap.elig_agent)[j])
+    else:
+        # constructive assignment
+        construct_sol(gap,work.sol,init == 'regret')
 
     # initialize obj, used, plt, job
     work.calc_obj(gap)
@@ -165,43 +775,400 @@ def init_sol(gap,work):
     work.calc_plt(gap)
     work.calc_job(gap)
 
+
+# --------------------------------------------------------------------
+#   construct initial solution
+#
+#   greedy: jobs in descending order of their smallest ratio a(i,j)/b(i)
+#   are assigned to the agent with the smallest desirability
+#   c(i,j)*a(i,j)/b(i) among those with enough residual capacity
+#
+#   regret: in the style of Martello and Toth, the job with the largest
+#   difference of desirability a(i,j)/b(i) between its best and second
+#   best agents with enough residual capacity is assigned to its best
+#   agent; the best two agents are recomputed only for jobs that lose
+#   one of them
+#
+#   the ratio a(i,j)/b(i) of an agent i without capacity (b(i) <= 0) is
+#   inf, so such an agent receives a job only as a job fitting no agent
+#
+#   ties of desirability are broken by the smallest agent index, and
+#   ties of difference by the smallest job index, on both the NumPy
+#   path for dense data and the python path for sparse data
+#
+#   a job that fits no agent is assigned to the agent with the smallest
+#   overload after all other jobs
+#
+#   gap(I): GAP data
+#   sol(O): job assignment to agent
+#   regret(I): regret heuristic -> True, greedy heuristic -> False
+# --------------------------------------------------------------------
+def construct_sol(gap,sol,regret):
+    num_agent, num_job = gap.num_agent, gap.num_job
+    cost, res, cap, elig_agent = gap.cost, gap.res, gap.cap, gap.elig_agent
+    resid = list(cap)
+    rest = []  # jobs fitting no agent
+    # NumPy arrays of all assignments are used for dense GAP data only
+    use_np = np is not None and not gap.sparse
+    # desirability of assigning job j to agent i (inf for agents without capacity)
+    if use_np:
+        res_a = np.array(res, dtype=np.float64)
+        resid_a = np.array(cap, dtype=np.float64)
+        # c(i,j)*a(i,j) is divided by b(i) as in python so that ties are rounded alike
+        des = res_a if regret else res_a * np.array(cost, dtype=np.float64)
+        des = np.divide(des, resid_a[:,None], out=np.zeros_like(res_a), where=resid_a[:,None] > 0)
+        des[resid_a <= 0] = np.inf
+    else:
+        des = [{j: (1 if regret else cost[i][j]) * res[i][j] / cap[i] if cap[i] > 0 else float('inf') for j in jobs} for i,jobs in enumerate(gap.elig_job)]
+
+    # assign job j to agent i
+    def assign(j,i):
+        sol[j] = i
+        resid[i] -= res[i][j]
+        if use_np:
+            resid_a[i] = resid[i]
+
+    # best two agents with enough residual capacity for jobs (numpy)
+    def best_two_np(jobs):
+        val = np.where(res_a[:,jobs] <= resid_a[:,None], des[:,jobs], np.inf)
+        idx = np.argsort(val, axis=0, kind='stable')
+        first = val[idx[0],np.arange(len(jobs))]
+        if num_agent > 1:
+            second = idx[1]
+            with np.errstate(invalid='ignore'):
+                prio = val[second,np.arange(len(jobs))] - first
+        else:
+            second = idx[0]
+            prio = np.full(len(jobs), np.inf)
+        prio[first == np.inf] = -1.0  # fits no agent
+        return idx[0], second, prio
+
+    # best two agents with enough residual capacity for job j (python)
+    def best_two(j):
+        val = {i: des[i][j] for i in elig_agent[j] if res[i][j] <= resid[i] and des[i][j] < float('inf')}
+        two = sorted(val, key=lambda i: (val[i], i))[:2]
+        return two, (val[two[1]] - val[two[0]] if len(two) == 2 else float('inf') if two else -1.0)
+
+    if regret and use_np:
+        # regret heuristic (vectorized over agents and jobs)
+        free = np.ones(num_job, dtype=bool)
+        best, second, prio = best_two_np(np.arange(num_job))
+        for _ in range(num_job):
+            j = int(np.argmax(prio))
+            if prio[j] < 0:
+                rest = np.flatnonzero(free).tolist()
+                break
+            i = int(best[j])
+            assign(j,i)
+            free[j] = False
+            prio[j] = -np.inf
+            # recompute best two agents of jobs losing agent i
+            lost = np.flatnonzero(free & ((best == i) | (second == i)) & (res_a[i] > resid_a[i]))
+            if lost.size:
+                best[lost], second[lost], prio[lost] = best_two_np(lost)
+    elif regret:
+        # regret heuristic
+        cand = {j: best_two(j) for j in range(num_job)}
+        while cand:
+            j = max(cand, key=lambda j: cand[j][1])
+            two,prio = cand.pop(j)
+            if prio < 0:
+                rest = [j] + list(cand)
+                break
+            i = two[0]
+            assign(j,i)
+            # recompute best two agents of jobs losing agent i
+            for h,(two,_) in list(cand.items()):
+                if i in two and res[i][h] > resid[i]:
+                    cand[h] = best_two(h)
+    else:
+        # greedy heuristic
+        order = sorted(range(num_job), key=lambda j: -min(res[i][j] / cap[i] if cap[i] > 0 else float('inf') for i in elig_agent[j]))
+        for j in order:
+            if use_np:
+                val = np.where(res_a[:,j] <= resid_a, des[:,j], np.inf)
+                i = int(np.argmin(val))
+                if val[i] < np.inf:
+                    assign(j,i)
+                else:
+                    rest.append(j)
+            else:
+                two,_ = best_two(j)
+                if two:
+                    assign(j,two[0])
+                else:
+                    rest.append(j)
+
+    # jobs fitting no agent
+    for j in rest:
+        assign(j, min(elig_agent[j], key=lambda i: res[i][j] - resid[i]))
+
+
 # --------------------------------------------------------------------
 #   weighting local search
 #
 #   gap(I): GAP data
 #   work(I/O): working data
 #   time_limit(I): time_limit
+#   param(I): parameters
+#   cur_work(I/O): current working data with penalty weights to
+#                  continue the search from, where work holds its
+#                  incumbent solution (None: start from initial solution)
+#   return: statistics of search
 # --------------------------------------------------------------------
-def weight_local_search(gap,work,time_limit):
-    print('\n[weighting local search]')
-    # generate initial solution
-    init_sol(gap,work)
+def weight_local_search(gap,work,time_limit,param,cur_work=None):
+    stat = Stat()
+    cont = cur_work is not None
+    if not cont:
+        cur_work = Work(gap)
+    elapsed = lag_time = 0.0
+    # adaptive scheduler of neighborhood searches
+    sched = Sched(nb_names(param)) if param.adaptive else None
+    # resume from checkpoint
+    resume = not cont and param.resume and param.checkpoint is not None and os.path.exists(param.checkpoint)
+    if resume:
+        elapsed, lag_time = gap_ckpt.read_checkpoint(param.checkpoint, gap, work, cur_work, stat, sched)
+        time_limit -= lag_time
+        gap_log.log(gap_log.SUMMARY, '\n[resume from checkpoint]')
+        gap_log.log(gap_log.SUMMARY, 'iter= {}\tobj= {:g}\t{:.2f} sec', stat.num_iter, work.obj, elapsed)
+    # lower bound by Lagrangian relaxation
+    elif param.lower_bound is not None:
+        stat.lower_bound = param.lower_bound
+    elif param.lag:
+        lag_time = time.time()
+        stat.lower_bound = lower_bound(gap,LAG_TIME_RATIO*time_limit)
+        lag_time = time.time() - lag_time
+        time_limit -= lag_time
 
-    # initialize current working data
-    cur_work = Work(gap)
-    cur_work.copy(work)
+    gap_log.log(gap_log.SUMMARY, '\n[weighting local search]')
+    # numpy engine evaluates all assignments of dense GAP data
+    if param.engine == 'numpy' and gap.sparse:
+        gap_log.log(gap_log.QUIET, 'numpy engine does not support sparse GAP data; falling back to python engine.')
+        param = copy.copy(param)
+        param.engine = 'python'
+    # prepare NumPy arrays for numpy engine and best-improvement
+    if param.engine == 'numpy' or (param.improve == 'best' and np is not None and not gap.sparse):
+        gap.make_array()
+    # sort jobs by resource consumption for pruned swap
+    if param.swap_nb == 'pruned':
+        gap.make_res_order()
+    # sort agents by cost for ejection chain
+    if param.chain_depth >= 2:
+        gap.make_cost_order()
 
-    # initialize penalty weight
-    init_weight(gap, cur_work)
+    if not resume and not cont:
+        # generate initial solution and initialize penalty weight
+        init_work(gap,work,cur_work,param.init)
+
+    # initialize don't-look bits for candidate list
+    if param.cand_list:
+        cur_work.dlb = bytearray(b'\x01') * gap.num_job
 
     # weighting local search
-    start_time = cur_time = disp_time = time.time()
-    cnt = 0
+    cur_time = disp_time = event_time = ckpt_time = time.time()
+    start_time = cur_time - elapsed
+    if not resume and work.plt < NUM_EPSILON:
+        stat.first_time = 0.0
+        if param.trace:
+            stat.trace.append((0.0, stat.num_iter, work.obj))
+    observer = param.observer
+    if observer is not None:
+        observer({'event': 'start', 'agents': gap.num_agent, 'jobs': gap.num_job, 'time_limit': time_limit, 'iter': stat.num_iter,
+                  'obj': work.obj, 'feasible': work.plt < NUM_EPSILON, 'lower_bound': stat.lower_bound})
+    cnt = stat.num_iter
     while cur_time - start_time < time_limit:
         best_obj = work.obj
+        best_feas = work.plt < NUM_EPSILON
         # local search algorithm
-        local_search(gap,work,cur_work)
-        # update penalty weight
-        update_weight(gap,cur_work,work.obj)
+        local_search(gap,work,cur_work,param,sched)
+        # update penalty weight by the best objective value among workers
+        th = work.obj
+        if param.shared_obj is not None:
+            with param.shared_obj.get_lock():
+                if work.plt < NUM_EPSILON and work.obj < param.shared_obj.value:
+                    param.shared_obj.value = work.obj
+                th = min(th, param.shared_obj.value)
+        update_weight(gap,cur_work,th,param)
         #print()
         cur_time = time.time()
         cnt += 1
-        # display current status
-        if work.obj < best_obj:
-            print('{}\t{:g} ({:g})\t*{:g}\t{:g}\t\t{:.2f} sec'.format(cnt,cur_work.obj,cur_work.obj+cur_work.plt,work.obj,cur_work.avg_wt(gap),cur_time-start_time),flush=True)
-        elif cur_time - disp_time > INTVL_TIME:
-            print('{}\t{:g} ({:g})\t{:g}\t{:g}\t\t{:.2f} sec'.format(cnt,cur_work.obj,cur_work.obj+cur_work.plt,work.obj,cur_work.avg_wt(gap),cur_time-start_time),flush=True)
-            disp_time = time.time()
+        if work.plt < NUM_EPSILON and (not best_feas or work.obj < best_obj):
+            stat.best_time = cur_time - start_time
+            if stat.first_time is None:
+                stat.first_time = stat.best_time
+            if param.trace:
+                stat.trace.append((stat.best_time, cnt, work.obj))
+            if observer is not None:
+                observer({'event': 'improve', 'iter': cnt, 'time': stat.best_time, 'obj': work.obj})
+        # emit periodic statistics
+        if observer is not None and cur_time - event_time > param.event_intvl:
+            observer({'event': 'stat', 'iter': cnt, 'time': cur_time - start_time, 'cur_obj': cur_work.obj, 'penalty': cur_work.plt,
+                      'avg_wt': cur_work.avg_wt(gap), 'obj': work.obj, 'feasible': work.plt < NUM_EPSILON, 'moves': cur_work.num_move,
+                      'evals': cur_work.num_eval})
+            event_time = cur_time
+        # display current status (statistics are computed only when displayed)
+        if gap_log.enabled(gap_log.SUMMARY):
+            if work.obj < best_obj:
+                gap_log.log(gap_log.SUMMARY, '{}\t{:g} ({:g})\t*{:g}\t{:g}\t\t{:.2f} sec', cnt,cur_work.obj,cur_work.obj+cur_work.plt,work.obj,cur_work.avg_wt(gap),cur_time-start_time)
+            elif cur_time - disp_time > INTVL_TIME:
+                gap_log.log(gap_log.SUMMARY, '{}\t{:g} ({:g})\t{:g}\t{:g}\t\t{:.2f} sec', cnt,cur_work.obj,cur_work.obj+cur_work.plt,work.obj,cur_work.avg_wt(gap),cur_time-start_time)
+                disp_time = time.time()
+        # write checkpoint
+        if param.checkpoint is not None and cur_time - ckpt_time > param.ckpt_intvl:
+            stat.num_iter = cnt
+            gap_ckpt.write_checkpoint(param.checkpoint, gap, work, cur_work, stat, cur_time - start_time, lag_time, sched)
+            ckpt_time = time.time()
+        # incumbent solution attains lower bound
+        if work.plt < NUM_EPSILON and work.obj <= stat.lower_bound + NUM_EPSILON:
+            gap_log.log(gap_log.SUMMARY, 'incumbent solution attains lower bound {:g}', stat.lower_bound)
+            break
+        # incumbent solution attains target
+        if param.target is not None and work.plt < NUM_EPSILON and work.obj <= param.target + NUM_EPSILON:
+            gap_log.log(gap_log.SUMMARY, 'incumbent solution attains target {:g}', param.target)
+            break
+
+    # write final checkpoint
+    stat.num_iter = cnt
+    if param.checkpoint is not None:
+        gap_ckpt.write_checkpoint(param.checkpoint, gap, work, cur_work, stat, cur_time - start_time, lag_time, sched)
+
+    # restore working data of incumbent solution
+    work.restore(gap)
+    stat.num_move = cur_work.num_move
+    if sched is not None:
+        sched.write()
+    stat.total_time = time.time() - start_time
+    if observer is not None:
+        observer({'event': 'final', 'obj': work.obj, 'feasible': work.plt < NUM_EPSILON, 'iter': stat.num_iter, 'moves': stat.num_move,
+                  'first_time': stat.first_time, 'best_time': stat.best_time, 'time': stat.total_time, 'lower_bound': stat.lower_bound})
+    return stat
+
+
+# --------------------------------------------------------------------
+#   lower bound by Lagrangian relaxation
+#
+#   gap(I): GAP data
+#   time_limit(I): time limit for subgradient method
+#   return: lower bound
+# --------------------------------------------------------------------
+def lower_bound(gap,time_limit):
+    start_time = time.time()
+    lag = gap_lag.solve_lagrange(gap, time_limit=time_limit)
+    gap_log.log(gap_log.SUMMARY, '\n[Lagrangian relaxation]')
+    gap_log.log(gap_log.SUMMARY, 'lb= {:g}\tub= {:g}\t#iter= {}\t{:.2f} sec', lag.lb, lag.ub, lag.num_iter, time.time() - start_time)
+    return lag.lb
+
+
+# --------------------------------------------------------------------
+#   parallel weighting local search
+#
+#   run independent weighting local searches with different random
+#   seeds and ratios of updating penalty weights in worker processes
+#   sharing the best objective value
+#
+#   gap(I): GAP data
+#   work(I/O): working data
+#   time_limit(I): time_limit
+#   param(I): parameters
+#   return: statistics of search (lower bound, computation time, and
+#           iterations, moves and times of the worker giving the best
+#           solution measured from the start of the worker)
+# --------------------------------------------------------------------
+def parallel_weight_local_search(gap,work,time_limit,param):
+    stat = Stat()
+    start_time = time.time()
+    # lower bound by Lagrangian relaxation shared among workers
+    if param.lag and param.lower_bound is None:
+        lag_time = time.time()
+        param.lower_bound = lower_bound(gap,LAG_TIME_RATIO*time_limit)
+        time_limit -= time.time() - lag_time
+
+    # parameters for workers
+    params = []
+    for k in range(param.num_worker):
+        worker_param = copy.copy(param)
+        worker_param.seed = param.seed + k
+        worker_param.observer = None
+        if k > 0:
+            rng = random.Random(worker_param.seed)
+            worker_param.inc_wt_ratio = param.inc_wt_ratio * rng.uniform(0.5, 2.0)
+            worker_param.dec_wt_ratio = param.dec_wt_ratio * rng.uniform(0.5, 2.0)
+        params.append(worker_param)
+
+    # run workers
+    shared_obj = multiprocessing.Value('d', float('inf'))
+    with multiprocessing.Pool(param.num_worker, initializer=init_worker, initargs=(shared_obj,gap_log.level)) as pool:
+        results = pool.starmap(run_worker, [(gap,time_limit,worker_param,k) for k,worker_param in enumerate(params)])
+
+    # collect the best solution
+    gap_log.log(gap_log.SUMMARY, '\n[parallel weighting local search]')
+    gap_log.log(gap_log.SUMMARY, 'worker\tseed\tinc\tdec\tobj')
+    for k,(sol,obj,plt,_,counters) in enumerate(results):
+        if counters is not None:
+            gap_prof.merge(counters)
+        gap_log.log(gap_log.SUMMARY, '{}\t{}\t{:.3f}\t{:.3f}\t{:g}{}', k,params[k].seed,params[k].inc_wt_ratio,params[k].dec_wt_ratio,obj,'' if plt < NUM_EPSILON else ' (infeasible)')
+    sol,_,_,worker_stat,_ = min(results, key=lambda result: (result[2] > NUM_EPSILON, result[1]))
+    work.sol = sol
+    work.restore(gap)
+    # statistics of the worker giving the best solution
+    stat.num_iter = worker_stat.num_iter
+    stat.num_move = worker_stat.num_move
+    stat.first_time = worker_stat.first_time
+    stat.best_time = worker_stat.best_time
+    stat.trace = worker_stat.trace
+    if param.lower_bound is not None:
+        stat.lower_bound = param.lower_bound
+    stat.total_time = time.time() - start_time
+    if param.observer is not None:
+        param.observer({'event': 'final', 'obj': work.obj, 'feasible': work.plt < NUM_EPSILON, 'iter': stat.num_iter, 'moves': stat.num_move,
+                        'first_time': stat.first_time, 'best_time': stat.best_time, 'time': stat.total_time, 'lower_bound': stat.lower_bound})
+    return stat
+
+
+# shared best objective value in worker process
+_shared_obj = None
+
+# initialize worker process ------------------------------------------
+def init_worker(shared_obj,log_level):
+    global _shared_obj
+    _shared_obj = shared_obj
+    gap_log.set_level(log_level)
+    if gap_prof.enabled:
+        gap_prof.reset()
+
+# run weighting local search in worker process -----------------------
+def run_worker(gap,time_limit,param,k):
+    param.shared_obj = _shared_obj
+    random.seed(param.seed)
+    work = Work(gap)
+    if k > 0:
+        # display logs of the first worker only
+        gap_log.set_level(gap_log.QUIET)
+    stat = weight_local_search(gap,work,time_limit,param)
+    # profiler counters are returned to be merged in the parent process
+    return work.sol, work.obj, work.plt, stat, gap_prof.phases if gap_prof.enabled else None
+
+
+# --------------------------------------------------------------------
+#   initial solution by weighting local search for MIP start
+#
+#   gap(I): GAP data
+#   time_limit(I): time limit for weighting local search
+#   param(I): parameters (default parameters if omitted)
+#   return: objective value and job assignment to agent (None if no
+#           feasible solution is found)
+# --------------------------------------------------------------------
+def warm_start(gap,time_limit,param=None):
+    param = param or Param()
+    random.seed(param.seed)
+    work = Work(gap)
+    if param.num_worker > 1:
+        parallel_weight_local_search(gap,work,time_limit,param)
+    else:
+        weight_local_search(gap,work,time_limit,param)
+    if work.plt > NUM_EPSILON:
+        return float('inf'), None
+    return work.obj, work.sol
 
 
 # --------------------------------------------------------------------
@@ -212,7 +1179,7 @@ def weight_local_search(gap,work,time_limit):
 # --------------------------------------------------------------------
 def init_weight(gap, work):
     for i in range(gap.num_agent):
-        for j in range(gap.num_job):
+        for j in (gap.elig_job)[i]:
             if (gap.cost)[i][j] > (work.wt)[i]:
                 (work.wt)[i] = (gap.cost)[i][j]
     # update weighted penalty
@@ -225,22 +1192,22 @@ def init_weight(gap, work):
 #   gap(I): GAP data
 #   work(I/O): working data
 #   th(I): threshold
+#   param(I): parameters
 # --------------------------------------------------------------------
-def update_weight(gap, work, th):
+def update_weight(gap, work, th, param):
     if work.obj + work.plt > th - NUM_EPSILON:
         # decrease penalty weight
         for i in range(gap.num_agent):
-            (work.wt)[i] = max(NUM_EPSILON, (1.0 - DEC_WT_RATIO) * (work.wt)[i])
+            (work.wt)[i] = max(NUM_EPSILON, (1.0 - param.dec_wt_ratio) * (work.wt)[i])
     else:
-        # increase penalty weight
-        max_plt = 0.0
-        for i in range(gap.num_agent):
-            if (work.used)[i] - (gap.cap)[i] > max_plt:
-                max_plt = (work.used)[i] - (gap.cap)[i]
-        for i in range(gap.num_agent):
-            (work.wt)[i] *= 1.0 + INC_WT_RATIO * max(0, (work.used)[i] - (gap.cap)[i]) / max_plt
+        # increase penalty weight of violating agents
+        for i in work.vio:
+            (work.wt)[i] *= 1.0 + param.inc_wt_ratio * ((work.used)[i] - (gap.cap)[i]) / work.max_vio
     # update weighted penalty
-    work.calc_plt(gap)
+    work.sum_plt(gap)
+    # turn on don't-look bits of all jobs
+    if work.dlb is not None:
+        work.dlb[:] = b'\x01' * gap.num_job
 
 
 # --------------------------------------------------------------------
@@ -249,19 +1216,133 @@ def update_weight(gap, work, th):
 #   gap(I): GAP data
 #   work(I/O): working data
 #   cur_work(I/O): current working data
+#   param(I): parameters
 #   return: found feasible solution in LS -> True
 # --------------------------------------------------------------------
-def local_search(gap,work,cur_work):
+def local_search(gap,work,cur_work,param,sched=None):
+    if sched is not None:
+        adaptive_local_search(gap,work,cur_work,param,sched)
+        return
     # local search
     while True:
         # shift neighborhood search
-        shift_nb_search(gap,work,cur_work)
+        if param.improve == 'best':
+            shift_nb_search_best(gap,work,cur_work,param.top_k)
+        elif param.cand_list:
+            shift_nb_search_cand(gap,work,cur_work)
+        elif param.engine == 'numpy':
+            shift_nb_search_np(gap,work,cur_work)
+        else:
+            shift_nb_search(gap,work,cur_work)
         # swap neighborhood search
-        if swap_nb_search(gap,work,cur_work):
+        if param.improve == 'best':
+            if swap_nb_search_best(gap,work,cur_work,param.top_k):
+                continue
+        elif param.swap_nb == 'pruned':
+            if swap_nb_search_pruned(gap,work,cur_work,param.swap_bound):
+                continue
+        elif swap_nb_search(gap,work,cur_work):
+            continue
+        # ejection chain neighborhood search
+        if param.chain_depth >= 2 and chain_nb_search(gap,work,cur_work,param.chain_depth):
             continue
         break
 
 
+# --------------------------------------------------------------------
+#   neighborhood searches in the default order
+#
+#   param(I): parameters
+#   return: names of neighborhood searches
+# --------------------------------------------------------------------
+def nb_names(param):
+    return ['shift', 'swap'] + (['chain'] if param.chain_depth >= 2 else [])
+
+
+# --------------------------------------------------------------------
+#   neighborhood search by name
+#
+#   gap(I): GAP data
+#   work(I/O): working data
+#   cur_work(I/O): current working data
+#   param(I): parameters
+#   nb(I): name of neighborhood search
+#   return: obtain improved solution -> True
+# --------------------------------------------------------------------
+def nb_search(gap,work,cur_work,param,nb):
+    if nb == 'shift':
+        if param.improve == 'best':
+            return shift_nb_search_best(gap,work,cur_work,param.top_k)
+        elif param.cand_list:
+            return shift_nb_search_cand(gap,work,cur_work)
+        elif param.engine == 'numpy':
+            return shift_nb_search_np(gap,work,cur_work)
+        return shift_nb_search(gap,work,cur_work)
+    elif nb == 'swap':
+        if param.improve == 'best':
+            return swap_nb_search_best(gap,work,cur_work,param.top_k)
+        elif param.swap_nb == 'pruned':
+            return swap_nb_search_pruned(gap,work,cur_work,param.swap_bound)
+        return swap_nb_search(gap,work,cur_work)
+    return chain_nb_search(gap,work,cur_work,param.chain_depth)
+
+
+# --------------------------------------------------------------------
+#   local search with adaptive scheduling of neighborhood searches
+#
+#   the neighborhood search with the highest yield among those not yet
+#   known to be locally optimal is called next; the shift neighborhood
+#   search is locally optimal after each call, since it applies
+#   improving moves until none is left, and the others are locally
+#   optimal after a call without improvement; every move changing the
+#   current solution makes the other neighborhood searches unchecked,
+#   and local search stops when all neighborhood searches not skipped
+#   by the scheduler are locally optimal; moves are accepted by the
+#   same rules as local_search
+#
+#   gap(I): GAP data
+#   work(I/O): working data
+#   cur_work(I/O): current working data
+#   param(I): parameters
+#   sched(I/O): adaptive scheduler of neighborhood searches
+# --------------------------------------------------------------------
+def adaptive_local_search(gap,work,cur_work,param,sched):
+    active = sched.active()
+    unchecked = set(active)
+    while unchecked:
+        nb = next(nb for nb in sched.order() if nb in unchecked)
+        value, num_eval = cur_work.obj + cur_work.plt, cur_work.num_eval
+        start = time.perf_counter()
+        improved = nb_search(gap,work,cur_work,param,nb)
+        sched.update(nb, value - cur_work.obj - cur_work.plt, cur_work.num_eval - num_eval, time.perf_counter() - start)
+        if improved:
+            unchecked = set(active)
+        if not improved or nb == 'shift':
+            unchecked.discard(nb)
+
+
+# --------------------------------------------------------------------
+#   calculate difference for shift operation
+#
+#   gap(I): GAP data
+#   work(I): working data
+#   j(I): job
+#   i(I): agent to which job j is shifted
+#   return: difference of objective value and weighted penalty
+# --------------------------------------------------------------------
+def calc_shift_diff(gap,work,j,i):
+    i1,i2 = (work.sol)[j],i
+    delta_obj = (gap.cost)[i2][j] - (gap.cost)[i1][j]
+    cur_plt = max(0, (work.used)[i1] - (gap.cap)[i1])
+    new_plt = max(0, (work.used)[i1] - (gap.res)[i1][j] - (gap.cap)[i1])
+    delta_plt_i1 = (work.wt)[i1] * (new_plt - cur_plt)
+    cur_plt = max(0, (work.used)[i2] - (gap.cap)[i2])
+    new_plt = max(0, (work.used)[i2] + (gap.res)[i2][j] - (gap.cap)[i2])
+    delta_plt_i2 = (work.wt)[i2] * (new_plt -  cur_plt)
+    delta_plt = delta_plt_i1 + delta_plt_i2
+    return delta_obj, delta_plt
+
+
 # --------------------------------------------------------------------
 #   shift neighborhood search
 #
@@ -271,58 +1352,267 @@ def local_search(gap,work,cur_work):
 #   return: obtain improved solution -> True
 # --------------------------------------------------------------------
 def shift_nb_search(gap,work,cur_work):
-    # calculate difference for shift operation
-    def calc_diff(gap,work,j,i):
-        i1,i2 = (work.sol)[j],i
-        delta_obj = (gap.cost)[i2][j] - (gap.cost)[i1][j]
-        cur_plt = max(0, (work.used)[i1] - (gap.cap)[i1])
-        new_plt = max(0, (work.used)[i1] - (gap.res)[i1][j] - (gap.cap)[i1])
-        delta_plt_i1 = (work.wt)[i1] * (new_plt - cur_plt)
-        cur_plt = max(0, (work.used)[i2] - (gap.cap)[i2])
-        new_plt = max(0, (work.used)[i2] + (gap.res)[i2][j] - (gap.cap)[i2])
-        delta_plt_i2 = (work.wt)[i2] * (new_plt -  cur_plt)
-        delta_plt = delta_plt_i1 + delta_plt_i2
-        return delta_obj, delta_plt
-
-    # update solution by shift operation
-    def update_sol(gap,work,j,i):
-        i1,i2 = (work.sol)[j],i
-        (work.sol)[j] = i2
-        (work.used)[i1] -= (gap.res)[i1][j]
-        (work.used)[i2] += (gap.res)[i2][j]
-        work.obj += (gap.cost)[i2][j] - (gap.cost)[i1][j]
-        work.calc_plt(gap)
-        (work.job)[i1].remove(j)
-        (work.job)[i2].add(j)
-
+    calc_diff = calc_shift_diff
+    num_eval = 0  # number of evaluated moves
+    elig_agent = gap.elig_agent
     # shift neighborhood search
     improved = False
     restart = True
     while restart:
         restart = False
-        nbhd = ((j,i)
-                for j in range(gap.num_job)
-                for i in range(gap.num_agent) if i != (cur_work.sol)[j])
-        for j,i in nbhd:
-            # calculate difference
-            delta_obj, delta_plt = calc_diff(gap,cur_work,j,i)
-            # (i) first feasible solution or (ii) improved feasible solution
-            if cur_work.plt + delta_plt < NUM_EPSILON and (work.plt > NUM_EPSILON  or cur_work.obj + delta_obj < work.obj - NUM_EPSILON):
-                # update incumbent solution
-                work.copy(cur_work)
-                update_sol(gap,work,j,i)
-                #print('*',flush=True,end='')
-            obj,plt = cur_work.obj, cur_work.plt
-            if delta_obj + delta_plt < -NUM_EPSILON:
-                # update current solution
-                update_sol(gap,cur_work,j,i)
-                assert abs(obj + plt + delta_obj + delta_plt - cur_work.obj - cur_work.plt) < NUM_EPSILON, (obj, plt, delta_obj+delta_plt, cur_work.obj, cur_work.plt)
-                #print('.',flush=True,end='')
-                improved = restart = True
+        for j in range(gap.num_job):
+            agents = elig_agent[j]
+            num_eval += len(agents) - 1  # counted per job
+            for i in agents:
+                if i == (cur_work.sol)[j]:
+                    continue
+                # calculate difference
+                delta_obj, delta_plt = calc_diff(gap,cur_work,j,i)
+                # (i) first feasible solution or (ii) improved feasible solution
+                if cur_work.plt + delta_plt < NUM_EPSILON and (work.plt > NUM_EPSILON  or cur_work.obj + delta_obj < work.obj - NUM_EPSILON):
+                    # update incumbent solution
+                    work.keep(cur_work,cur_work.obj+delta_obj,((j,i),))
+                    #print('*',flush=True,end='')
+                obj,plt = cur_work.obj, cur_work.plt
+                if delta_obj + delta_plt < -NUM_EPSILON:
+                    # update current solution
+                    cur_work.shift(gap,j,i)
+                    assert abs(obj + plt + delta_obj + delta_plt - cur_work.obj - cur_work.plt) < NUM_EPSILON, (obj, plt, delta_obj+delta_plt, cur_work.obj, cur_work.plt)
+                    #print('.',flush=True,end='')
+                    improved = restart = True
+                    break
+            if restart:
                 break
+    cur_work.num_eval += num_eval
     return improved
 
 
+# --------------------------------------------------------------------
+#   shift neighborhood search with candidate list
+#
+#   each job has a don't-look bit; a job is examined only while its bit
+#   is on, and its bit is turned off when no improving shift of the job
+#   is found; Work.shift and Work.swap turn on the bits of the jobs on
+#   the two agents touched by a move, and update_weight turns on all
+#   bits; the scan resumes from the job next to the last move instead
+#   of restarting from job 0
+#
+#   gap(I): GAP data
+#   work(I/O): working data
+#   cur_work(I/O): current working data
+#   return: obtain improved solution -> True
+# --------------------------------------------------------------------
+def shift_nb_search_cand(gap,work,cur_work):
+    calc_diff = calc_shift_diff
+    num_eval = 0  # number of evaluated moves
+    dlb = cur_work.dlb
+    num_job, elig_agent = gap.num_job, gap.elig_agent
+    # shift neighborhood search
+    improved = False
+    j = idle = 0
+    while idle < num_job:
+        if dlb[j]:
+            dlb[j] = 0
+            num_eval += len(elig_agent[j]) - 1  # counted per job
+            for i in elig_agent[j]:
+                if i == (cur_work.sol)[j]:
+                    continue
+                # calculate difference
+                delta_obj, delta_plt = calc_diff(gap,cur_work,j,i)
+                # (i) first feasible solution or (ii) improved feasible solution
+                if cur_work.plt + delta_plt < NUM_EPSILON and (work.plt > NUM_EPSILON  or cur_work.obj + delta_obj < work.obj - NUM_EPSILON):
+                    # update incumbent solution
+                    work.keep(cur_work,cur_work.obj+delta_obj,((j,i),))
+                obj,plt = cur_work.obj, cur_work.plt
+                if delta_obj + delta_plt < -NUM_EPSILON:
+                    # update current solution (turns on bits of jobs on both agents)
+                    cur_work.shift(gap,j,i)
+                    assert abs(obj + plt + delta_obj + delta_plt - cur_work.obj - cur_work.plt) < NUM_EPSILON, (obj, plt, delta_obj+delta_plt, cur_work.obj, cur_work.plt)
+                    improved = True
+                    idle = -1
+                    break
+        idle += 1
+        j = j + 1 if j + 1 < num_job else 0
+    cur_work.num_eval += num_eval
+    return improved
+
+
+# --------------------------------------------------------------------
+#   calculate difference for all shift operations (numpy engine)
+#
+#   gap(I): GAP data with NumPy arrays
+#   sol(I): job assignment to agent (NumPy array)
+#   used(I): used resource for agent (NumPy array)
+#   wt(I): penalty weight (NumPy array)
+#   return: differences of objective value and weighted penalty of
+#           shifting job j to agent i as n x m arrays (inf penalty for
+#           current assignment)
+# --------------------------------------------------------------------
+def calc_shift_diff_np(gap,sol,used,wt):
+    jobs = np.arange(gap.num_job)
+    cost_t, res_t, cap = gap.cost_t, gap.res_t, gap.cap_a
+    over = np.maximum(0.0, used - cap)
+    cost_cur = cost_t[jobs,sol]
+    res_cur = res_t[jobs,sol]
+    delta_obj = cost_t - cost_cur[:,None]
+    new_plt = np.maximum(0.0, used[sol] - res_cur - cap[sol])
+    delta_plt_i1 = wt[sol] * (new_plt - over[sol])
+    new_plt = np.maximum(0.0, used + res_t - cap)
+    delta_plt = wt * (new_plt - over) + delta_plt_i1[:,None]
+    delta_plt[jobs,sol] = np.inf  # exclude current assignment
+    return delta_obj, delta_plt
+
+
+# --------------------------------------------------------------------
+#   shift neighborhood search (numpy engine)
+#
+#   evaluate the whole shift neighborhood in one vectorized pass and
+#   apply the same first-improvement rule as shift_nb_search
+#
+#   gap(I): GAP data
+#   work(I/O): working data
+#   cur_work(I/O): current working data
+#   return: obtain improved solution -> True
+# --------------------------------------------------------------------
+def shift_nb_search_np(gap,work,cur_work):
+    # current working data as NumPy arrays
+    sol = np.array(cur_work.sol, dtype=np.intp)
+    used = np.array(cur_work.used, dtype=np.float64)
+    wt = np.array(cur_work.wt, dtype=np.float64)
+
+    # shift neighborhood search
+    improved = False
+    while True:
+        # calculate difference for all shift operations (j,i)
+        delta_obj, delta_plt = calc_shift_diff_np(gap,sol,used,wt)
+        delta_obj = delta_obj.ravel()
+        delta_plt = delta_plt.ravel()
+        # first improving move in (j,i) order
+        cand = np.flatnonzero(delta_obj + delta_plt < -NUM_EPSILON)
+        last = cand[0] if cand.size else delta_obj.size - 1
+        cur_work.num_eval += int(last) + 1
+        # (i) first feasible solution or (ii) improved feasible solution among scanned moves
+        feas_obj = np.where(cur_work.plt + delta_plt[:last+1] < NUM_EPSILON, cur_work.obj + delta_obj[:last+1], np.inf)
+        k = int(np.argmin(feas_obj))
+        if feas_obj[k] < np.inf and (work.plt > NUM_EPSILON or feas_obj[k] < work.obj - NUM_EPSILON):
+            # update incumbent solution
+            work.keep(cur_work,float(feas_obj[k]),(divmod(k,gap.num_agent),))
+        if not cand.size:
+            break
+        # update current solution
+        j,i = divmod(int(last), gap.num_agent)
+        i1 = sol[j]
+        cur_work.shift(gap,j,i)
+        sol[j] = i
+        used[i1] = (cur_work.used)[i1]
+        used[i] = (cur_work.used)[i]
+        improved = True
+    return improved
+
+
+# --------------------------------------------------------------------
+#   choose move among best improving moves
+#
+#   moves(I): (difference, move...) of the best improving moves in
+#             ascending order of difference
+#   top_k(I): number of best improving moves to choose from
+#   return: move chosen uniformly at random (the best one for top_k = 1)
+# --------------------------------------------------------------------
+def choose_move(moves, top_k):
+    return moves[0][1:] if top_k == 1 else random.choice(moves)[1:]
+
+
+# --------------------------------------------------------------------
+#   shift neighborhood search (best-improvement)
+#
+#   evaluate the whole shift neighborhood, which is a single array
+#   operation for dense GAP data with NumPy, and apply the best
+#   improving move (or one of the top_k best ones at random) until no
+#   improving move is left; the incumbent solution is updated by the
+#   best feasible solution among all evaluated moves
+#
+#   gap(I): GAP data
+#   work(I/O): working data
+#   cur_work(I/O): current working data
+#   top_k(I): number of best improving moves to choose from
+#   return: obtain improved solution -> True
+# --------------------------------------------------------------------
+def shift_nb_search_best(gap,work,cur_work,top_k):
+    use_np = np is not None and not gap.sparse
+    num_agent = gap.num_agent
+    num_eval = 0  # number of evaluated moves
+    # shift neighborhood search
+    improved = False
+    while True:
+        if use_np:
+            # calculate difference for all shift operations (j,i)
+            sol = np.array(cur_work.sol, dtype=np.intp)
+            used = np.array(cur_work.used, dtype=np.float64)
+            wt = np.array(cur_work.wt, dtype=np.float64)
+            delta_obj, delta_plt = calc_shift_diff_np(gap,sol,used,wt)
+            delta_obj = delta_obj.ravel()
+            delta_plt = delta_plt.ravel()
+            num_eval += delta_obj.size - gap.num_job
+            # best feasible solution
+            feas_obj = np.where(cur_work.plt + delta_plt < NUM_EPSILON, cur_work.obj + delta_obj, np.inf)
+            k = int(np.argmin(feas_obj))
+            best_obj, best_move = float(feas_obj[k]), divmod(k, num_agent)
+            # best improving moves
+            delta = delta_obj + delta_plt
+            cand = np.flatnonzero(delta < -NUM_EPSILON)
+            if cand.size > top_k:
+                cand = cand[np.argpartition(delta[cand], top_k - 1)[:top_k]]
+            moves = sorted((float(delta[k]),) + divmod(int(k), num_agent) for k in cand)
+        else:
+            best_obj, best_move = float('inf'), None
+            moves = []
+            for j in range(gap.num_job):
+                num_eval += len((gap.elig_agent)[j]) - 1  # counted per job
+                for i in (gap.elig_agent)[j]:
+                    if i == (cur_work.sol)[j]:
+                        continue
+                    # calculate difference
+                    delta_obj, delta_plt = calc_shift_diff(gap,cur_work,j,i)
+                    if cur_work.plt + delta_plt < NUM_EPSILON and cur_work.obj + delta_obj < best_obj:
+                        best_obj, best_move = cur_work.obj + delta_obj, (j,i)
+                    if delta_obj + delta_plt < -NUM_EPSILON:
+                        moves.append((delta_obj + delta_plt, j, i))
+            moves = heapq.nsmallest(top_k, moves)
+        # (i) first feasible solution or (ii) improved feasible solution
+        if best_obj < float('inf') and (work.plt > NUM_EPSILON or best_obj < work.obj - NUM_EPSILON):
+            # update incumbent solution
+            work.keep(cur_work,best_obj,(best_move,))
+        if not moves:
+            break
+        # update current solution
+        j,i = choose_move(moves, top_k)
+        cur_work.shift(gap,j,i)
+        improved = True
+    cur_work.num_eval += num_eval
+    return improved
+
+
+# --------------------------------------------------------------------
+#   calculate difference for swap operation
+#
+#   gap(I): GAP data
+#   work(I): working data
+#   j1,j2(I): jobs whose agents are swapped
+#   return: difference of objective value and weighted penalty
+# --------------------------------------------------------------------
+def calc_swap_diff(gap,work,j1,j2):
+    i1,i2 = (work.sol)[j1],(work.sol)[j2]
+    delta_obj = (gap.cost)[i2][j1] + (gap.cost)[i1][j2] - (gap.cost)[i1][j1] - (gap.cost)[i2][j2]
+    cur_plt = max(0, (work.used)[i1] - (gap.cap)[i1])
+    new_plt = max(0, (work.used)[i1] - (gap.res)[i1][j1] + (gap.res)[i1][j2] - (gap.cap)[i1])
+    delta_plt_i1 = (work.wt)[i1] * (new_plt - cur_plt)
+    cur_plt = max(0, (work.used)[i2] - (gap.cap)[i2])
+    new_plt = max(0, (work.used)[i2] - (gap.res)[i2][j2] + (gap.res)[i2][j1] - (gap.cap)[i2])
+    delta_plt_i2 = (work.wt)[i2] * (new_plt - cur_plt)
+    delta_plt = delta_plt_i1 + delta_plt_i2
+    return delta_obj, delta_plt
+
+
 # --------------------------------------------------------------------
 #   swap neighborhood search
 #
@@ -332,59 +1622,332 @@ def shift_nb_search(gap,work,cur_work):
 #   return: obtain improved solution -> True
 # --------------------------------------------------------------------
 def swap_nb_search(gap,work,cur_work):
-    # calculate difference for swap operation
-    def calc_diff(gap,work,j1,j2):
-        i1,i2 = (work.sol)[j1],(work.sol)[j2]
-        delta_obj = (gap.cost)[i2][j1] + (gap.cost)[i1][j2] - (gap.cost)[i1][j1] - (gap.cost)[i2][j2]
-        cur_plt = max(0, (work.used)[i1] - (gap.cap)[i1])
-        new_plt = max(0, (work.used)[i1] - (gap.res)[i1][j1] + (gap.res)[i1][j2] - (gap.cap)[i1])
-        delta_plt_i1 = (work.wt)[i1] * (new_plt - cur_plt)
-        cur_plt = max(0, (work.used)[i2] - (gap.cap)[i2])
-        new_plt = max(0, (work.used)[i2] - (gap.res)[i2][j2] + (gap.res)[i2][j1] - (gap.cap)[i2])
-        delta_plt_i2 = (work.wt)[i2] * (new_plt - cur_plt)
-        delta_plt = delta_plt_i1 + delta_plt_i2
-        return delta_obj, delta_plt
-
-    # update solution by swap operation
-    def update_sol(gap,work,j1,j2):
-        i1,i2 = (work.sol)[j1],(work.sol)[j2]
-        (work.sol)[j1], (work.sol)[j2] = i2, i1
-        (work.used)[i1] += (gap.res)[i1][j2] - (gap.res)[i1][j1]
-        (work.used)[i2] += (gap.res)[i2][j1] - (gap.res)[i2][j2]
-        work.obj += (gap.cost)[i2][j1] + (gap.cost)[i1][j2] - (gap.cost)[i1][j1] - (gap.cost)[i2][j2]
-        work.calc_plt(gap)
-        (work.job)[i1].remove(j1)
-        (work.job)[i2].add(j1)
-        (work.job)[i2].remove(j2)
-        (work.job)[i1].add(j2)
-
+    calc_diff = calc_swap_diff
+    num_eval = 0  # number of evaluated moves
     # swap neighborhood search
     #nbhd = ((j1,j2)
     #        for j1 in range(gap.num_job)
     #        for j2 in range(j1+1,gap.num_job) if (cur_work.sol)[j2] != (cur_work.sol)[j1])
-    nbhd = ((j1,j2)
-            for i in range(gap.num_agent) if (cur_work.used)[i] > (gap.cap)[i]
-            for j1 in (cur_work.job)[i]
-            for j2 in range(j1+1,gap.num_job) if (cur_work.sol)[j2] != (cur_work.sol)[j1])
-    for j1,j2 in nbhd:
-        # calculate difference
-        delta_obj,delta_plt = calc_diff(gap,cur_work,j1,j2)
-        # (i) first feasible solution or (ii) improved feasible solution
-        if cur_work.plt + delta_plt < NUM_EPSILON and (work.plt > NUM_EPSILON or cur_work.obj + delta_obj < work.obj - NUM_EPSILON):
-            # update incumbent solution
-            work.copy(cur_work)
-            update_sol(gap,work,j1,j2)
-            #print('*',flush=True,end='')
-        obj,plt = cur_work.obj, cur_work.plt
-        if delta_obj + delta_plt < -NUM_EPSILON:
-            # update current solution
-            update_sol(gap,cur_work,j1,j2)
-            assert abs(obj + plt + delta_obj+delta_plt - cur_work.obj - cur_work.plt) < NUM_EPSILON, (obj, plt, delta_obj+delta_plt, cur_work.obj, cur_work.plt)
-            #print(':',flush=True,end='')
-            return True
+    num_job, sparse = gap.num_job, gap.sparse
+    sol, cost = cur_work.sol, gap.cost
+    # jobs j1 on agent i in ascending order regardless of the layout of job lists
+    for i in sorted(cur_work.vio):
+        for j1 in sorted((cur_work.job)[i]):
+            if not sparse:
+                partners = range(j1+1,num_job)
+            else:
+                # job j2 eligible for agent i and job j1 eligible for agent of j2
+                partners = (gap.elig_job)[i]
+            num_eval += len(partners)  # counted per job j1
+            for j2 in partners:
+                if sol[j2] == i or (sparse and (j2 <= j1 or j1 not in cost[sol[j2]])):
+                    continue
+                # calculate difference
+                delta_obj,delta_plt = calc_diff(gap,cur_work,j1,j2)
+                # (i) first feasible solution or (ii) improved feasible solution
+                if cur_work.plt + delta_plt < NUM_EPSILON and (work.plt > NUM_EPSILON or cur_work.obj + delta_obj < work.obj - NUM_EPSILON):
+                    # update incumbent solution
+                    work.keep(cur_work,cur_work.obj+delta_obj,((j1,sol[j2]),(j2,sol[j1])))
+                    #print('*',flush=True,end='')
+                obj,plt = cur_work.obj, cur_work.plt
+                if delta_obj + delta_plt < -NUM_EPSILON:
+                    # update current solution
+                    cur_work.swap(gap,j1,j2)
+                    assert abs(obj + plt + delta_obj+delta_plt - cur_work.obj - cur_work.plt) < NUM_EPSILON, (obj, plt, delta_obj+delta_plt, cur_work.obj, cur_work.plt)
+                    #print(':',flush=True,end='')
+                    cur_work.num_eval += num_eval
+                    return True
+    cur_work.num_eval += num_eval
+    return False
+
+
+# --------------------------------------------------------------------
+#   pruned swap neighborhood search
+#
+#   for each job j1 on a violating agent i1, only partner jobs j2 with
+#   a(i1,j2) < a(i1,j1) are enumerated, i.e., the swaps reducing the
+#   overload on i1, by scanning the jobs sorted by resource consumption
+#   of i1; with bound, a pair is skipped when even removing the whole
+#   overload on i2 cannot make the swap improving, and the swap cannot
+#   improve the incumbent solution either, i.e., some violating agent
+#   other than i1 and i2 remains or the objective value is not better
+#   than the incumbent; the same moves are applied and the same
+#   incumbent solutions are recorded as without bound
+#
+#   gap(I): GAP data
+#   work(I/O): working data
+#   cur_work(I/O): current working data
+#   bound(I): skip pairs by lower bound of difference -> True
+#   return: obtain improved solution -> True
+# --------------------------------------------------------------------
+def swap_nb_search_pruned(gap,work,cur_work,bound):
+    calc_diff = calc_swap_diff
+    num_eval = 0  # number of evaluated moves
+    cost, res, cap = gap.cost, gap.res, gap.cap
+    sol, used, wt = cur_work.sol, cur_work.used, cur_work.wt
+    sparse = gap.sparse
+    num_vio = len(cur_work.vio)
+    # swap neighborhood search
+    for i1 in sorted(cur_work.vio):
+        vio1 = used[i1] - cap[i1]
+        order = (gap.res_order)[i1]
+        for j1 in sorted((cur_work.job)[i1]):
+            # partner jobs reducing the overload on i1 (counted per job j1)
+            num_k = bisect.bisect_left((gap.res_sorted)[i1], res[i1][j1])
+            num_eval += num_k
+            for k in range(num_k):
+                j2 = order[k]
+                i2 = sol[j2]
+                if i2 == i1 or (sparse and j1 not in cost[i2]):
+                    continue
+                if bound:
+                    # lower bound of difference
+                    delta_obj = cost[i2][j1] + cost[i1][j2] - cost[i1][j1] - cost[i2][j2]
+                    delta_plt = -wt[i1] * min(vio1, res[i1][j1] - res[i1][j2]) - wt[i2] * max(0, used[i2] - cap[i2])
+                    if delta_obj + delta_plt >= -NUM_EPSILON:
+                        # swap can give feasible solution only if no other agent violates capacity
+                        if num_vio > (2 if used[i2] > cap[i2] else 1) or (work.plt < NUM_EPSILON and cur_work.obj + delta_obj >= work.obj - NUM_EPSILON):
+                            continue
+                # calculate difference
+                delta_obj,delta_plt = calc_diff(gap,cur_work,j1,j2)
+                # (i) first feasible solution or (ii) improved feasible solution
+                if cur_work.plt + delta_plt < NUM_EPSILON and (work.plt > NUM_EPSILON or cur_work.obj + delta_obj < work.obj - NUM_EPSILON):
+                    # update incumbent solution
+                    work.keep(cur_work,cur_work.obj+delta_obj,((j1,i2),(j2,i1)))
+                obj,plt = cur_work.obj, cur_work.plt
+                if delta_obj + delta_plt < -NUM_EPSILON:
+                    # update current solution
+                    cur_work.swap(gap,j1,j2)
+                    assert abs(obj + plt + delta_obj+delta_plt - cur_work.obj - cur_work.plt) < NUM_EPSILON, (obj, plt, delta_obj+delta_plt, cur_work.obj, cur_work.plt)
+                    cur_work.num_eval += num_eval
+                    return True
+    cur_work.num_eval += num_eval
+    return False
+
+
+# --------------------------------------------------------------------
+#   swap neighborhood search (best-improvement)
+#
+#   evaluate all swaps of a job j1 on a violating agent with a job j2 on
+#   another agent, in blocks of up to SWAP_BLOCK swaps as array
+#   operations for dense GAP data with NumPy, and apply the best
+#   improving swap (or one of the top_k best ones at random); the
+#   incumbent solution is updated by the best feasible solution among
+#   all evaluated swaps
+#
+#   gap(I): GAP data
+#   work(I/O): working data
+#   cur_work(I/O): current working data
+#   top_k(I): number of best improving moves to choose from
+#   return: obtain improved solution -> True
+# --------------------------------------------------------------------
+def swap_nb_search_best(gap,work,cur_work,top_k):
+    best_obj, best_move = float('inf'), None
+    num_eval = 0  # number of evaluated moves
+    moves = []
+    if np is not None and not gap.sparse:
+        num_job = gap.num_job
+        jobs = np.arange(num_job)
+        cost_t, res_t, cap = gap.cost_t, gap.res_t, gap.cap_a
+        # current working data as NumPy arrays
+        sol = np.array(cur_work.sol, dtype=np.intp)
+        used = np.array(cur_work.used, dtype=np.float64)
+        wt = np.array(cur_work.wt, dtype=np.float64)
+        over = np.maximum(0.0, used - cap)
+        cost_cur = cost_t[jobs,sol]
+        res_cur = res_t[jobs,sol]
+        size = max(1, SWAP_BLOCK // num_job)
+        for i1 in sorted(cur_work.vio):
+            job1 = np.array(sorted((cur_work.job)[i1]), dtype=np.intp)
+            same = sol == i1
+            for start in range(0, job1.size, size):
+                # calculate difference for swaps of jobs j1 in block with all jobs j2
+                j1 = job1[start:start+size,None]
+                delta_obj = cost_t[j1,sol] + cost_t[:,i1] - cost_cur[j1] - cost_cur
+                new_plt = np.maximum(0.0, used[i1] - res_cur[j1] + res_t[:,i1] - cap[i1])
+                delta_plt = wt[i1] * (new_plt - over[i1])
+                new_plt = np.maximum(0.0, used[sol] - res_cur + res_t[j1,sol] - cap[sol])
+                delta_plt = delta_plt + wt[sol] * (new_plt - over[sol])
+                delta_plt[:,same] = np.inf  # exclude jobs on agent i1
+                num_eval += len(j1) * (num_job - int(np.count_nonzero(same)))
+                delta_obj = delta_obj.ravel()
+                delta_plt = delta_plt.ravel()
+                # best feasible solution
+                feas_obj = np.where(cur_work.plt + delta_plt < NUM_EPSILON, cur_work.obj + delta_obj, np.inf)
+                k = int(np.argmin(feas_obj))
+                if feas_obj[k] < best_obj:
+                    r,j2 = divmod(k, num_job)
+                    best_obj, best_move = float(feas_obj[k]), (int(job1[start+r]), j2)
+                # best improving moves
+                delta = delta_obj + delta_plt
+                cand = np.flatnonzero(delta < -NUM_EPSILON)
+                if cand.size > top_k:
+                    cand = cand[np.argpartition(delta[cand], top_k - 1)[:top_k]]
+                for k in cand:
+                    r,j2 = divmod(int(k), num_job)
+                    moves.append((float(delta[k]), int(job1[start+r]), j2))
+    else:
+        sol, cost = cur_work.sol, gap.cost
+        for i1 in sorted(cur_work.vio):
+            for j1 in sorted((cur_work.job)[i1]):
+                num_eval += len((gap.elig_job)[i1])  # counted per job j1
+                for j2 in (gap.elig_job)[i1]:
+                    i2 = sol[j2]
+                    if i2 == i1 or (gap.sparse and j1 not in cost[i2]):
+                        continue
+                    # calculate difference
+                    delta_obj,delta_plt = calc_swap_diff(gap,cur_work,j1,j2)
+                    if cur_work.plt + delta_plt < NUM_EPSILON and cur_work.obj + delta_obj < best_obj:
+                        best_obj, best_move = cur_work.obj + delta_obj, (j1,j2)
+                    if delta_obj + delta_plt < -NUM_EPSILON:
+                        moves.append((delta_obj + delta_plt, j1, j2))
+    moves = heapq.nsmallest(top_k, moves)
+    # (i) first feasible solution or (ii) improved feasible solution
+    if best_move is not None and (work.plt > NUM_EPSILON or best_obj < work.obj - NUM_EPSILON):
+        # update incumbent solution
+        j1,j2 = best_move
+        work.keep(cur_work,best_obj,((j1,(cur_work.sol)[j2]),(j2,(cur_work.sol)[j1])))
+    if not moves:
+        cur_work.num_eval += num_eval
+        return False
+    # update current solution
+    j1,j2 = choose_move(moves, top_k)
+    cur_work.swap(gap,j1,j2)
+    cur_work.num_eval += num_eval
+    return True
+
+
+# --------------------------------------------------------------------
+#   ejection chain neighborhood search
+#
+#   a chain shifts job j1 from a violating agent i1 to agent i2, ejects
+#   job j2 from i2 to agent i3, and so on, visiting distinct agents;
+#   a chain is extended only while its last agent is overloaded after
+#   the insertion, and every chain of two or more shifts is evaluated
+#   by the same difference and incumbent-update rule as shift and swap;
+#   the last shift of a chain scans agents in ascending order of cost
+#   and stops when neither the current nor the incumbent solution can
+#   be improved, since receiving a job never decreases the penalty;
+#   a chain is extended only through the CHAIN_WIDTH cheapest unvisited
+#   agents for each job and by ejecting the CHAIN_EJECT jobs with the
+#   largest resource consumption, and the search gives up after
+#   evaluating CHAIN_EVALS chains, which bounds the work of one call
+#   independently of the depth
+#
+#   gap(I): GAP data
+#   work(I/O): working data
+#   cur_work(I/O): current working data
+#   depth(I): maximum number of shifts in chain
+#   return: obtain improved solution -> True
+# --------------------------------------------------------------------
+def chain_nb_search(gap,work,cur_work,depth):
+    cost, res, cap, cost_order = gap.cost, gap.res, gap.cap, gap.cost_order
+    used, wt, job = cur_work.used, cur_work.wt, cur_work.job
+    over = [max(0, used[i] - cap[i]) for i in range(gap.num_agent)]
+    moves = []  # shifts (j,i) of chain
+    visited = [False] * gap.num_agent  # agents in chain
+    evals = 0  # number of evaluated chains
+
+    # upper bound of cost of the last shift of job j improving current
+    # or incumbent solution
+    def cost_bound(delta_obj, delta_plt):
+        bound = -NUM_EPSILON - delta_plt - delta_obj
+        if cur_work.plt + delta_plt < NUM_EPSILON:
+            bound = max(bound, work.obj - cur_work.obj - NUM_EPSILON - delta_obj if work.plt < NUM_EPSILON else float('inf'))
+        return bound
+
+    # extend chain by shifting ejected job j to an unvisited agent i;
+    # (delta_obj, delta_plt) is the difference of the chain so far
+    # excluding the cost and penalty of agent i receiving job j
+    def extend(j, delta_obj, delta_plt):
+        nonlocal evals
+        last = len(moves) + 1 >= depth
+        last2 = len(moves) + 2 == depth
+        if last:
+            bound = cost_bound(delta_obj, delta_plt)
+        width = 0
+        for i in cost_order[j]:
+            if last and cost[i][j] >= bound:
+                break
+            if visited[i]:
+                continue
+            if evals >= CHAIN_EVALS:
+                return None
+            evals += 1
+            # close chain at agent i
+            new_used = used[i] + res[i][j]
+            obj = delta_obj + cost[i][j]
+            plt = delta_plt + wt[i] * (max(0, new_used - cap[i]) - over[i])
+            moves.append((j,i))
+            if len(moves) >= 2:
+                # (i) first feasible solution or (ii) improved feasible solution
+                if cur_work.plt + plt < NUM_EPSILON and (work.plt > NUM_EPSILON or cur_work.obj + obj < work.obj - NUM_EPSILON):
+                    # update incumbent solution
+                    work.keep(cur_work,cur_work.obj+obj,moves)
+                if obj + plt < -NUM_EPSILON:
+                    return obj + plt
+            # eject a job from agent i overloaded by the insertion
+            if not last and new_used > cap[i] and width < CHAIN_WIDTH:
+                width += 1
+                visited[i] = True
+                for j2 in heapq.nlargest(CHAIN_EJECT, job[i], key=res[i].__getitem__):
+                    new_plt = wt[i] * (max(0, new_used - res[i][j2] - cap[i]) - over[i])
+                    if last2 and cost[cost_order[j2][0]][j2] >= cost_bound(obj - cost[i][j2], delta_plt + new_plt):
+                        continue
+                    delta = extend(j2, obj - cost[i][j2], delta_plt + new_plt)
+                    if delta is not None:
+                        return delta
+                visited[i] = False
+            moves.pop()
+        return None
+
+    # chain neighborhood search
+    for i1 in sorted(cur_work.vio):
+        visited[i1] = True
+        for j1 in job[i1]:
+            if evals >= CHAIN_EVALS:
+                cur_work.num_eval += evals
+                return False
+            delta_plt = wt[i1] * (max(0, used[i1] - res[i1][j1] - cap[i1]) - over[i1])
+            delta = extend(j1, -cost[i1][j1], delta_plt)
+            if delta is not None:
+                # update current solution
+                obj,plt = cur_work.obj, cur_work.plt
+                for j,i in moves:
+                    cur_work.shift(gap,j,i)
+                assert abs(obj + plt + delta - cur_work.obj - cur_work.plt) < NUM_EPSILON, (obj, plt, delta, cur_work.obj, cur_work.plt)
+                cur_work.num_eval += evals
+                return True
+        visited[i1] = False
+    cur_work.num_eval += evals
     return False
 
 
+# --------------------------------------------------------------------
+#   add options of search read by Param.read_search
+#
+#   shared by the solver, the benchmark, the batch solver and the warm
+#   start of the MIP solvers
+# --------------------------------------------------------------------
+def add_search_args(parser):
+    # engine for shift neighborhood search
+    parser.add_argument('-e', '--engine', help='engine for shift neighborhood search', choices=['python','numpy'], default=ENGINE)
+    # candidate list for shift neighborhood search
+    parser.add_argument('-c', '--cand-list', help='use candidate list (don\'t-look bits) for shift neighborhood search', action='store_true')
+    # swap neighborhood search
+    parser.add_argument('-s', '--swap', help='swap neighborhood search', choices=['full','pruned'], default=SWAP_NB)
+    parser.add_argument('--swap-bound', help='skip swaps by lower bound of difference in pruned swap', action='store_true')
+    # ejection chain neighborhood search
+    parser.add_argument('-x', '--chain', help='maximum number of shifts in ejection chain (0: off)', type=int, default=CHAIN_DEPTH)
+    # construction of initial solution
+    parser.add_argument('-i', '--init', help='construction of initial solution', choices=['random','greedy','regret'], default=INIT)
+    # move selection of shift and swap neighborhood searches
+    parser.add_argument('--improve', help='move selection of shift and swap neighborhood searches', choices=['first','best'], default=IMPROVE)
+    parser.add_argument('-k', '--top-k', help='choose randomly among this number of best improving moves (best-improvement)', type=int, default=TOP_K)
+    # adaptive scheduling of neighborhood searches
+    parser.add_argument('--adaptive', help='schedule neighborhood searches adaptively by improvement per evaluated move', action='store_true')
+
+
 # --------------------------------------------------------------------
 #   parse arguments
 # --------------------------------------------------------------------
@@ -394,6 +1957,26 @@ def parse_args():
     parser.add_argument('filename', action='store')
     # timelimit for solver
     parser.add_argument('-t', '--time', help='time limit for weighting local search', type=float, default=TIME_LIMIT)
+    # binary cache of instance file
+    parser.add_argument('--no-cache', help='do not use binary cache of instance file', dest='cache', action='store_false')
+    # sparse instance file
+    parser.add_argument('--sparse', help='read sparse instance file of eligible assignments', action='store_true')
+    # log level
+    parser.add_argument('-l', '--log', help='log level', choices=list(gap_log.LEVELS), default=gap_log.LOG_LEVEL)
+    # options of search
+    add_search_args(parser)
+    # lower bound by Lagrangian relaxation
+    parser.add_argument('--lag', help='compute lower bound by Lagrangian relaxation and stop when incumbent solution attains it', action='store_true')
+    # number of worker processes
+    parser.add_argument('-w', '--workers', help='number of worker processes', type=int, default=NUM_WORKER)
+    # event stream
+    parser.add_argument('--events', help='write events of search as NDJSON to file descriptor (number), file or - (stdout)')
+    # checkpoint
+    parser.add_argument('--checkpoint', help='checkpoint file written periodically during search')
+    parser.add_argument('--ckpt-intvl', help='interval time for writing checkpoint', type=float, default=CKPT_INTVL)
+    parser.add_argument('--resume', help='resume search from checkpoint file if exists', action='store_true')
+    # profiler counters
+    parser.add_argument('--profile', help='count evaluated and accepted moves and measure time of each phase, and display profile table', action='store_true')
     return parser.parse_args()
 
 
@@ -403,9 +1986,7 @@ def parse_args():
 def main(argv=sys.argv):
     # parse arguments
     args = parse_args()
-
-    # set random seed
-    random.seed(RANDOM_SEED)
+    gap_log.set_level(args.log)
 
     # set starting time
     start_time = time.time()
@@ -413,18 +1994,37 @@ def main(argv=sys.argv):
     # read instance
     gap = Gap()
     gap.read(args)
-    gap.write()
+    if gap_log.enabled(gap_log.TRACE):
+        gap.write()
+
+    # set parameters
+    param = Param()
+    param.read(args)
+
+    # set random seed
+    random.seed(param.seed)
+
+    # enable profiler counters
+    if args.profile:
+        gap_prof.enable(sys.modules[__name__])
 
     # solve GAP
     work = Work(gap)
-    weight_local_search(gap, work, args.time)  # weighting local search
+    if param.num_worker > 1:
+        parallel_weight_local_search(gap, work, args.time, param)  # parallel weighting local search
+    else:
+        weight_local_search(gap, work, args.time, param)  # weighting local search
     work.write(gap)
+    if param.observer is not None:
+        param.observer.close()
+    if args.profile:
+        gap_prof.report()
 
     # set completion time
     end_time = time.time()
 
     # display computation time
-    print('\nTotal time:\t%.3f sec' % (end_time - start_time))
+    gap_log.log(gap_log.SUMMARY, '\nTotal time:\t{:.3f} sec', end_time - start_time)
 
 # main ---------------------------------------------------------------
 if __name__ == "__main__":